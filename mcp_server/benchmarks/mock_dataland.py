@@ -0,0 +1,261 @@
+"""This module contains a local stand-in for the Dataland API used to benchmark the MCP server."""
+
+import copy
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+DATA_TYPES = ["sfdr", "eutaxonomy-financials", "eutaxonomy-non-financials", "nuclear-and-gas"]
+REPORTING_PERIODS = ["2022", "2023", "2024"]
+PORTFOLIO_ID = "benchmark-portfolio"
+
+
+def _data_point(value: Any, unit: Optional[str] = None, page: int = 1) -> Dict[str, Any]:
+    data_point = {
+        "value": value,
+        "quality": "Reported",
+        "dataSource": {"page": str(page), "fileName": "Annual Report", "fileReference": "0" * 64},
+    }
+    if unit is not None:
+        data_point["currency"] = unit
+    return data_point
+
+
+def synthetic_report(data_type: str, seed: int) -> Dict[str, Any]:
+    """
+    Creates the data of a synthetic dataset, used if no recorded fixture exists for the data type.
+
+    :param data_type: The data type of the dataset, e.g. "sfdr".
+    :param seed: Seed varying the numeric values between companies.
+
+    :return: The data of the dataset.
+    """
+    rng = random.Random(seed)
+    general = {"fiscalYearDeviation": "NoDeviation", "fiscalYearEnd": "2024-12-31", "dataDate": "2024-12-31"}
+    if data_type == "sfdr":
+        return {
+            "general": {"general": {**general, "referencedReports": {}}},
+            "environmental": {
+                "greenhouseGasEmissions": {
+                    f"scope{scope}GhgEmissionsInTonnes": _data_point(round(rng.uniform(1e3, 1e6), 2), page=scope)
+                    for scope in (1, 2, 3)
+                },
+                "energyPerformance": {
+                    "renewableEnergyConsumptionInGWh": _data_point(round(rng.uniform(1, 500), 2), page=20),
+                    "nonRenewableEnergyConsumptionInGWh": _data_point(round(rng.uniform(1, 5000), 2), page=20),
+                },
+            },
+            "social": {
+                "socialAndEmployeeMatters": {
+                    f"indicator{index}": _data_point("Yes" if rng.random() > 0.5 else "No", page=30 + index)
+                    for index in range(40)
+                },
+            },
+        }
+    return {
+        "general": {key: {"value": value} for key, value in general.items()},
+        "revenue": {
+            "totalAmount": _data_point(round(rng.uniform(1e6, 1e10), 2), unit="EUR", page=40),
+            "alignedShare": {"relativeShareInPercent": _data_point(round(rng.uniform(0, 60), 2), page=41)},
+            "eligibleShare": {"relativeShareInPercent": _data_point(round(rng.uniform(0, 90), 2), page=41)},
+        },
+        "capex": {
+            "totalAmount": _data_point(round(rng.uniform(1e5, 1e9), 2), unit="EUR", page=42),
+            "alignedShare": {"relativeShareInPercent": _data_point(round(rng.uniform(0, 60), 2), page=43)},
+        },
+    }
+
+
+class MockDataland:
+    """
+    Serves the Dataland endpoints used by the MCP server from fixtures on a local HTTP server:
+    the company search, the metadata, the framework data of all data types and the portfolios of the user.
+    Every response is delayed by a configurable latency and fails with a configurable error rate.
+    The number of requests per endpoint is recorded, so that the upstream load of a benchmark can be reported.
+    """
+
+    def __init__(
+            self,
+            companies: int = 100,
+            latency: float = 0.05,
+            latency_jitter: float = 0.02,
+            error_rate: float = 0.0,
+            fixtures_dir: Optional[str] = None,
+            seed: int = 42):
+        """
+        :param companies: Number of companies served.
+        :param latency: Mean delay of a response in seconds.
+        :param latency_jitter: Maximum random deviation of the delay from the mean in seconds.
+        :param error_rate: Share of requests failing with status 503.
+        :param fixtures_dir: Directory of recorded datasets named <data type>.json. Synthetic data is used otherwise.
+        :param seed: Seed of the random latency, errors and synthetic data.
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.request_counts: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.companies = [
+            {
+                "companyId": f"company-{index:05d}",
+                "companyName": f"Benchmark Company {index:05d} AG",
+                "headquarters": "Frankfurt am Main",
+                "countryCode": "DE",
+                "sector": "Industrials",
+                "lei": f"BENCH{index:013d}00",
+            }
+            for index in range(companies)
+        ]
+        self.fixtures = {data_type: self._load_fixture(fixtures_dir, data_type) for data_type in DATA_TYPES}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @staticmethod
+    def _load_fixture(fixtures_dir: Optional[str], data_type: str) -> Optional[Dict[str, Any]]:
+        """Loads the data of a recorded dataset of the data type, if one exists."""
+        if not fixtures_dir:
+            return None
+        path = os.path.join(fixtures_dir, f"{data_type}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    @property
+    def url(self) -> str:
+        """The base URL of the running mock, to be used as Dataland URL of the client."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockDataland":
+        """Starts serving on a free local port on a daemon thread."""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                mock.handle(self)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="mock-dataland", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_counts(self) -> None:
+        """Resets the recorded request counts."""
+        with self._lock:
+            self.request_counts.clear()
+
+    def handle(self, request: BaseHTTPRequestHandler) -> None:
+        """Answers a request after the configured latency, failing with the configured error rate."""
+        url = urlparse(request.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        endpoint, status, body = self.route(url.path, query)
+        with self._lock:
+            self.request_counts[endpoint] += 1
+            delay = max(self.latency + self._random.uniform(-self.latency_jitter, self.latency_jitter), 0.0)
+            fail = self._random.random() < self.error_rate
+        time.sleep(delay)
+        if fail:
+            status, body = 503, {"errors": [{"summary": "Service Unavailable"}]}
+        payload = json.dumps(body).encode("utf-8")
+        request.send_response(status)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def route(self, path: str, query: Dict[str, str]) -> Tuple[str, int, Any]:
+        """
+        Computes the response of a request.
+
+        :param path: The path of the request, e.g. "/api/companies".
+        :param query: The query parameters of the request.
+
+        :return: The name of the endpoint, the response status and the JSON body.
+        """
+        parts = [part for part in path.split("/") if part]
+        if parts == ["api", "companies"]:
+            return "companies", 200, self.search_companies(query)
+        if parts == ["api", "metadata"]:
+            return "metadata", 200, self.metadata(query)
+        if len(parts) == 5 and parts[:2] == ["api", "data"] and parts[3] == "companies":
+            return f"data/{parts[2]}", 200, self.datasets(parts[2], parts[4], query.get("reportingPeriod"))
+        if len(parts) == 3 and parts[:2] == ["users", "portfolios"]:
+            return "portfolio", 200, self.portfolio(parts[2])
+        return "unknown", 404, {"errors": [{"summary": f"No mock for {path}"}]}
+
+    def search_companies(self, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        search_string = query.get("searchString", "").casefold()
+        hits = [company for company in self.companies if search_string in company["companyName"].casefold()]
+        if "chunkSize" in query:
+            chunk_size = int(query["chunkSize"])
+            start = int(query.get("chunkIndex", 0)) * chunk_size
+            hits = hits[start:start + chunk_size]
+        return hits
+
+    def _has_report(self, company_id: str, data_type: str, reporting_period: str) -> bool:
+        """Every company reports SFDR data, three quarters of the companies report each other data type."""
+        index = int(company_id.rsplit("-", 1)[-1])
+        return data_type == "sfdr" or (index + DATA_TYPES.index(data_type) + int(reporting_period)) % 4 != 0
+
+    def _meta_info(self, company_id: str, data_type: str, reporting_period: str) -> Dict[str, Any]:
+        return {
+            "dataId": f"{company_id}-{data_type}-{reporting_period}",
+            "companyId": company_id,
+            "dataType": data_type,
+            "uploaderUserId": "benchmark",
+            "uploadTime": 1_700_000_000_000 + int(reporting_period),
+            "reportingPeriod": reporting_period,
+            "currentlyActive": True,
+            "qaStatus": "Accepted",
+            "ref": f"https://dataland.com/companies/{company_id}/frameworks/{data_type}",
+        }
+
+    def metadata(self, query: Dict[str, str]) -> List[Dict[str, Any]]:
+        company_id = query.get("companyId")
+        return [
+            self._meta_info(company_id, data_type, reporting_period)
+            for data_type in DATA_TYPES
+            for reporting_period in REPORTING_PERIODS
+            if query.get("dataType", data_type) == data_type
+            and query.get("reportingPeriod", reporting_period) == reporting_period
+            and self._has_report(company_id, data_type, reporting_period)
+        ]
+
+    def datasets(self, data_type: str, company_id: str, reporting_period: Optional[str]) -> List[Dict[str, Any]]:
+        periods = [reporting_period] if reporting_period else REPORTING_PERIODS
+        seed = int(company_id.rsplit("-", 1)[-1])
+        return [
+            {
+                "metaInfo": self._meta_info(company_id, data_type, period),
+                "data": copy.deepcopy(self.fixtures[data_type]) or synthetic_report(data_type, seed),
+            }
+            for period in periods
+            if self._has_report(company_id, data_type, period)
+        ]
+
+    def portfolio(self, portfolio_id: str) -> Dict[str, Any]:
+        return {
+            "portfolioId": portfolio_id,
+            "portfolioName": "Benchmark Portfolio",
+            "userId": "benchmark",
+            "creationTimestamp": 1_700_000_000_000,
+            "lastUpdateTimestamp": 1_700_000_000_000,
+            "companyIds": [company["companyId"] for company in self.companies],
+        }
@@ -0,0 +1,257 @@
+"""
+Benchmarks the Dataland MCP server against a local stand-in for the Dataland API.
+
+Every scenario runs in its own process against a new server with cold caches, drives concurrent MCP tool calls through
+an in-memory MCP client and reports the throughput, the latency percentiles, the peak memory of the process and the
+number of Dataland requests.
+
+Usage (from the mcp_server directory, with the generated Dataland clients installed):
+    python benchmarks/run_benchmarks.py --companies 200 --calls 400 --concurrency 16 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fastmcp import Client  # noqa: E402
+
+from dataland_client import DatalandClient  # noqa: E402
+from mock_dataland import PORTFOLIO_ID, MockDataland  # noqa: E402
+from server import DatalandMCPServer  # noqa: E402
+from settings import ServerSettings  # noqa: E402
+
+GHG_FIELDS = [
+    "environmental.greenhouseGasEmissions.scope1GhgEmissionsInTonnes",
+    "environmental.greenhouseGasEmissions.scope2GhgEmissionsInTonnes",
+]
+
+
+@dataclasses.dataclass
+class Scenario:
+    """A benchmark scenario calling a tool with the arguments computed for every call index."""
+
+    name: str
+    description: str
+    tool: str
+    arguments: Callable[[int, List[str]], Dict[str, Any]]
+    # Number of calls of the scenario, defaults to the --calls option
+    calls: Optional[int] = None
+    # Whether the calls are repeated once before measuring, so that the caches are warm
+    warm_up: bool = False
+
+
+def scenarios(args: argparse.Namespace) -> List[Scenario]:
+    """Defines the benchmark scenarios."""
+    return [
+        Scenario(
+            "cold_reports", "SFDR reports of distinct companies with cold caches",
+            "SFDR_Report", lambda i, names: {"company_name": names[i % len(names)], "reporting_period": "2024"},
+        ),
+        Scenario(
+            "warm_reports", "SFDR reports of distinct companies with warm caches",
+            "SFDR_Report", lambda i, names: {"company_name": names[i % len(names)], "reporting_period": "2024"},
+            warm_up=True,
+        ),
+        Scenario(
+            "hot_company", "concurrent identical SFDR reports of a single company",
+            "SFDR_Report", lambda i, names: {"company_name": names[0], "reporting_period": "2024"},
+        ),
+        Scenario(
+            "projected_table", "projected SFDR reports in the table format",
+            "SFDR_Report", lambda i, names: {
+                "company_name": names[i % len(names)], "reporting_period": "2024",
+                "fields": ["environmental.greenhouseGasEmissions"], "output_format": "table"},
+        ),
+        Scenario(
+            "available_reports", "available reports of distinct companies",
+            "Company_Available_Reports", lambda i, names: {"company_name": names[i % len(names)]},
+        ),
+        Scenario(
+            "batch", "batches of 10 companies, 2 periods and 2 frameworks",
+            "Batch_Report_Data", lambda i, names: {
+                "company_names": [names[(i * 10 + j) % len(names)] for j in range(10)],
+                "reporting_periods": ["2023", "2024"], "data_types": ["sfdr", "eutaxonomy-non-financials"],
+                "output_format": "table"},
+            calls=max(args.calls // 20, 1),
+        ),
+        Scenario(
+            "portfolio_coverage", "SFDR 2024 coverage of the whole portfolio",
+            "Report_Coverage", lambda i, names: {
+                "portfolio_id": PORTFOLIO_ID, "data_types": ["sfdr"], "reporting_periods": ["2024"]},
+            calls=max(args.calls // 100, 1),
+        ),
+        Scenario(
+            "portfolio_aggregates", "GHG emission statistics of the whole portfolio",
+            "Portfolio_Aggregates", lambda i, names: {
+                "portfolio_id": PORTFOLIO_ID, "data_type": "sfdr", "reporting_period": "2024", "fields": GHG_FIELDS},
+            calls=max(args.calls // 100, 1),
+        ),
+    ]
+
+
+def is_error(result: Any) -> bool:
+    """Whether a tool result is an error, i.e. an exception string or a structured error."""
+    if result.is_error or not result.content:
+        return True
+    text = getattr(result.content[0], "text", "")
+    if not text.startswith(("{", "[")):
+        return True
+    return text.startswith('{"error"')
+
+
+def percentile(values: List[float], percent: int) -> float:
+    """The percentile of the values, computed like the server metrics."""
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def max_rss_mib() -> float:
+    """The peak resident set size of the process in MiB, i.e. of the scenario running in the process."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+async def run_scenario(scenario: Scenario, mock: MockDataland, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Runs a scenario against a new server with cold caches.
+
+    :return: The results of the scenario.
+    """
+    settings = dataclasses.replace(
+        ServerSettings.from_env(), cache_path="", cache_url="", tool_max_workers=args.concurrency,
+        upstream_rate_limit=args.rate_limit)
+    client = DatalandClient(dataland_url=mock.url, api_key="benchmark")
+    server = DatalandMCPServer(client, settings)
+    names = [company["companyName"] for company in mock.companies]
+    calls = scenario.calls or args.calls
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with Client(server.app) as mcp_client:
+        async def call(index: int) -> tuple:
+            async with semaphore:
+                start = time.perf_counter()
+                result = await mcp_client.call_tool(
+                    scenario.tool, scenario.arguments(index, names), raise_on_error=False)
+                return time.perf_counter() - start, is_error(result)
+
+        if scenario.warm_up:
+            await asyncio.gather(*(call(index) for index in range(calls)))
+        mock.reset_counts()
+        if args.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(call(index) for index in range(calls)))
+        duration = time.perf_counter() - start
+        traced_peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+        if args.trace_memory:
+            tracemalloc.stop()
+
+    server.executor.shutdown()
+    server.utils.close()
+    client.close()
+    latencies = sorted(latency for latency, _ in outcomes)
+    return {
+        "scenario": scenario.name,
+        "description": scenario.description,
+        "calls": calls,
+        "errors": sum(error for _, error in outcomes),
+        "throughput": calls / duration,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "maxRssMiB": max_rss_mib(),
+        "tracedPeakMiB": None if traced_peak is None else traced_peak / (1024 * 1024),
+        "upstreamRequests": sum(mock.request_counts.values()),
+        "upstreamByEndpoint": dict(sorted(mock.request_counts.items())),
+    }
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Prints the results as a table."""
+    header = (f"{'scenario':<22}{'calls':>7}{'errors':>8}{'calls/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+              f"{'RSS MiB':>9}{'upstream':>10}")
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result['scenario']:<22}{result['calls']:>7}{result['errors']:>8}{result['throughput']:>10.1f}"
+            f"{result['p50'] * 1000:>9.1f}{result['p95'] * 1000:>9.1f}{result['p99'] * 1000:>9.1f}"
+            f"{result['maxRssMiB']:>9.1f}{result['upstreamRequests']:>10}"
+        )
+    print()
+    for result in results:
+        endpoints = ", ".join(f"{endpoint}={count}" for endpoint, count in result["upstreamByEndpoint"].items())
+        memory = "" if result["tracedPeakMiB"] is None else f" (traced peak {result['tracedPeakMiB']:.1f} MiB)"
+        print(f"{result['scenario']}: {result['description']}{memory}; upstream: {endpoints or 'none'}")
+
+
+def start_mock(args: argparse.Namespace) -> MockDataland:
+    """Starts the mock Dataland API configured by the command line arguments."""
+    return MockDataland(
+        companies=args.companies,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        fixtures_dir=args.fixtures,
+    ).start()
+
+
+def run_scenario_process(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Runs a scenario in the current process against its own mock Dataland API.
+    Every scenario runs in a new process, so that the peak memory of the process is the peak memory of the scenario.
+
+    :return: The results of the scenario.
+    """
+    scenario = next(scenario for scenario in scenarios(args) if scenario.name == name)
+    mock = start_mock(args)
+    try:
+        return asyncio.run(run_scenario(scenario, mock, args))
+    finally:
+        mock.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Dataland MCP server against a mock Dataland API")
+    parser.add_argument("--companies", type=int, default=100, help="Number of companies served by the mock")
+    parser.add_argument("--calls", type=int, default=200, help="Number of tool calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Number of concurrent tool calls")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean latency of the mock in seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.02, help="Maximum latency deviation in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of mock requests failing with 503")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="Rate limit of the requests per second to the mock, 0 (default) disables the limit")
+    parser.add_argument("--fixtures", default=None, help="Directory of recorded datasets named <data type>.json")
+    parser.add_argument("--scenarios", nargs="*", default=None, help="Names of the scenarios to run, all if omitted")
+    parser.add_argument("--trace-memory", action="store_true", help="Trace the peak Python memory per scenario")
+    parser.add_argument("--json", dest="json_path", default=None, help="File to write the results to as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for scenario in scenarios(args):
+        if args.scenarios and scenario.name not in args.scenarios:
+            continue
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results.append(pool.submit(run_scenario_process, scenario.name, args).result())
+
+    print_results(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
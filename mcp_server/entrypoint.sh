@@ -15,7 +15,11 @@ sed -i "s/PLACEHOLDER_DATALAND_API_KEY/${DATALAND_API_KEY}/g" mcp.json
 echo "Generating Dataland API clients..."
 ./bin/generate_dataland_api_clients.sh
 echo "Installing dependencies..."
-pdm install --prod
+if [ -n "$OPTIONAL_DEPENDENCIES" ]; then
+    pdm install --prod -G "$OPTIONAL_DEPENDENCIES"
+else
+    pdm install --prod
+fi
 
 
 echo "Starting up DatalandMCP..."
@@ -0,0 +1,59 @@
+"""This module contains helpers to aggregate numeric data points of many reports into portfolio statistics."""
+
+import math
+import statistics
+from typing import Any, Dict, List, Optional, Tuple
+
+PERCENTILES = (10, 25, 75, 90)
+
+
+def extract_data_point(data: Any, field_path: str) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Extracts the numeric value of a data point from the data of a dataset.
+
+    :param data: The data of a dataset, i.e. the nested categories and data points of a report.
+    :param field_path: The dot-separated path of the data point, e.g. "environmental.greenhouseGasEmissions.scope1GhgEmissionsInTonnes".
+
+    :return: The numeric value and unit of the data point, or None and None if it does not exist or is not numeric.
+    """
+    value: Any = data
+    for key in field_path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None, None
+        value = value[key]
+    unit = None
+    if isinstance(value, dict):
+        unit = value.get("unit") or value.get("currency")
+        value = value.get("value")
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return None, None
+    try:
+        number = float(value)
+    except ValueError:
+        return None, None
+    return (number, unit) if math.isfinite(number) else (None, None)
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """
+    Computes the sum, mean, median, minimum, maximum and percentiles of numeric values.
+
+    :param values: The numeric values, e.g. the scope 1 emissions of all companies of a portfolio.
+
+    :return: The statistics, which are None if there are no values. The percentiles are keyed as "p10", "p25", etc.
+    """
+    if not values:
+        return {"sum": None, "mean": None, "median": None, "min": None, "max": None,
+                **{f"p{percentile}": None for percentile in PERCENTILES}}
+    ordered = sorted(values)
+    total = math.fsum(ordered)
+    cut_points = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else ordered * 99
+    summary = {
+        "sum": total,
+        "mean": total / len(ordered),
+        "median": statistics.median(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+        **{f"p{percentile}": cut_points[percentile - 1] for percentile in PERCENTILES},
+    }
+    return {statistic: round(value, 6) for statistic, value in summary.items()}
@@ -0,0 +1,638 @@
+"""This module contains the caches used to avoid redundant requests against Dataland."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import warnings
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Protocol, Tuple
+
+
+@dataclass
+class CacheStats:
+    """Counters describing the effectiveness of a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    store_hits: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """The share of lookups that were answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheStore(Protocol):
+    """Key-value store backing the in-memory caches, separating the entries of different caches by namespaces."""
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[Any, Optional[float]]]: ...
+
+    def set(self, namespace: str, key: str, value: Any, expires_at: Optional[float]) -> None: ...
+
+    def delete(self, namespace: str, key: Optional[str] = None) -> None: ...
+
+    def items(self, namespace: str, limit: int) -> Iterator[Tuple[str, Any, Optional[float]]]: ...
+
+    def close(self) -> None: ...
+
+
+class SQLiteCacheStore:
+    """
+    Persistent key-value store in a local SQLite database, which keeps cached data across server restarts.
+    Values must be JSON compatible and are stored as compressed JSON. Entries of different caches are separated
+    by namespaces. If the database grows beyond its size limit, the least recently written entries are removed until
+    it is below a low-water mark, so that the following writes do not evict again right away.
+    The size is tracked incrementally between periodic checks against the database, which may be shared by the worker
+    processes of a node and thereby grow by their writes as well.
+    If the database cannot be accessed, lookups are treated as misses and writes are skipped, so the in-memory caches
+    keep working on their own.
+    """
+
+    # Share of the size limit the database is reduced to by an eviction
+    low_water_ratio = 0.9
+    # Number of writes after which the tracked size is checked against the size of the database
+    size_check_interval = 100
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        """
+        :param path: File path of the SQLite database. Missing parent directories are created.
+        :param max_bytes: Maximum total size of the stored compressed values. Not limited if None or not positive.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes if max_bytes and max_bytes > 0 else None
+        self._lock = threading.Lock()
+        self._warned = False
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL, "
+            "size INTEGER NOT NULL, written_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS cache_entries_written_at ON cache_entries (written_at)")
+        # Covering index, so that the total size is summed without reading the values
+        self._connection.execute("CREATE INDEX IF NOT EXISTS cache_entries_size ON cache_entries (size)")
+        # Upper bound of the stored bytes, as replaced entries and writes of other processes are not accounted for
+        self._tracked_bytes = self._stored_bytes()
+        self._writes_since_check = 0
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _decode(payload: bytes) -> Any:
+        return json.loads(zlib.decompress(payload))
+
+    def _unavailable(self, exc: Exception) -> None:
+        """Warns once that the database cannot be accessed."""
+        if not self._warned:
+            self._warned = True
+            warnings.warn(f"The cache database at {self.path} is not accessible, only in-memory caches are used: {exc}")
+
+    def _stored_bytes(self) -> int:
+        """The total size of the stored values of all processes sharing the database. The caller must hold the lock."""
+        return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """
+        Looks up a non-expired entry.
+
+        :param namespace: The namespace of the entry, i.e. the name of the cache.
+        :param key: The key of the entry.
+
+        :return: The value and its expiry timestamp, or None if no valid entry exists or the database is not accessible.
+        """
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ? "
+                    "AND (expires_at IS NULL OR expires_at > ?)",
+                    (namespace, key, time.time()),
+                ).fetchone()
+        except sqlite3.Error as exc:
+            self._unavailable(exc)
+            return None
+        if row is None:
+            return None
+        return self._decode(row[0]), row[1]
+
+    def set(self, namespace: str, key: str, value: Any, expires_at: Optional[float]) -> None:
+        """
+        Inserts or replaces an entry and enforces the size limit of the store.
+
+        :param namespace: The namespace of the entry, i.e. the name of the cache.
+        :param key: The key of the entry.
+        :param value: The JSON compatible value to store.
+        :param expires_at: The timestamp after which the entry expires, or None if it never expires.
+        """
+        payload = self._encode(value)
+        try:
+            with self._lock:
+                # A single statement, so that concurrent writers of the same key in other processes do not conflict
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, size, written_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (namespace, key, payload, expires_at, len(payload), time.time()),
+                )
+                if self.max_bytes is not None:
+                    self._tracked_bytes += len(payload)
+                    self._writes_since_check += 1
+                    if self._tracked_bytes > self.max_bytes or self._writes_since_check >= self.size_check_interval:
+                        self._tracked_bytes = self._stored_bytes()
+                        self._writes_since_check = 0
+                        if self._tracked_bytes > self.max_bytes:
+                            self._evict()
+        except sqlite3.Error as exc:
+            self._unavailable(exc)
+
+    def delete(self, namespace: str, key: Optional[str] = None) -> None:
+        """
+        Removes a single entry or, if no key is given, all entries of a namespace.
+
+        :param namespace: The namespace of the entries, i.e. the name of the cache.
+        :param key: The key of the entry to remove.
+        """
+        try:
+            with self._lock:
+                if key is not None:
+                    self._connection.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+                else:
+                    self._connection.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+        except sqlite3.Error as exc:
+            self._unavailable(exc)
+
+    def items(self, namespace: str, limit: int) -> Iterator[Tuple[str, Any, Optional[float]]]:
+        """
+        Iterates over the non-expired entries of a namespace, most recently written first.
+        The values are read and decoded one at a time, so only the consumed entries are held in memory.
+
+        :param namespace: The namespace of the entries, i.e. the name of the cache.
+        :param limit: The maximum number of entries.
+
+        :return: An iterator of keys, values and expiry timestamps.
+        """
+        try:
+            with self._lock:
+                keys = [key for (key,) in self._connection.execute(
+                    "SELECT key FROM cache_entries WHERE namespace = ? "
+                    "AND (expires_at IS NULL OR expires_at > ?) ORDER BY written_at DESC LIMIT ?",
+                    (namespace, time.time(), limit),
+                )]
+        except sqlite3.Error as exc:
+            self._unavailable(exc)
+            return
+        for key in keys:
+            stored = self.get(namespace, key)
+            if stored is not None:
+                yield key, stored[0], stored[1]
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self) -> None:
+        """
+        Removes expired and then the least recently written entries until the size is below the low-water mark.
+        The caller must hold the lock.
+        """
+        self._connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        rows = self._connection.execute("SELECT rowid, size FROM cache_entries ORDER BY written_at DESC").fetchall()
+        low_water_mark = int(self.max_bytes * self.low_water_ratio)
+        retained_bytes = 0
+        evicted_rowids = []
+        for rowid, size in rows:
+            if retained_bytes + size <= low_water_mark:
+                retained_bytes += size
+            else:
+                evicted_rowids.append((rowid,))
+        self._connection.executemany("DELETE FROM cache_entries WHERE rowid = ?", evicted_rowids)
+        self._tracked_bytes = retained_bytes
+
+
+class RedisCacheStore:
+    """
+    Shared key-value store in a Redis compatible server, e.g. Redis or Valkey, which shares cached data between the
+    worker processes and replicas of the server. Values must be JSON compatible and are stored as compressed JSON,
+    expiring entries are expired by the server. The write order of each namespace is kept in a sorted set, so that the
+    most recently written entries can be warm loaded.
+    If the server is not reachable, lookups are treated as misses and writes are skipped, so the in-memory caches
+    keep working on their own.
+    """
+
+    def __init__(self, url: str, key_prefix: str = "dataland_mcp", socket_timeout: float = 1.0):
+        """
+        :param url: URL of the server, e.g. "redis://localhost:6379/0".
+        :param key_prefix: Prefix of all keys written by the store.
+        :param socket_timeout: Timeout in seconds of a request to the server.
+        :raises ImportError: If the optional redis package is not installed.
+        """
+        import redis
+
+        self.url = url
+        self.key_prefix = key_prefix
+        self._errors = (redis.RedisError, OSError)
+        self._client = redis.Redis.from_url(url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout)
+        self._warned = False
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.key_prefix}:{namespace}:{key}"
+
+    def _written_key(self, namespace: str) -> str:
+        return f"{self.key_prefix}:{namespace}:__written__"
+
+    def _unavailable(self, exc: Exception) -> None:
+        """Warns once that the server is not reachable."""
+        if not self._warned:
+            self._warned = True
+            warnings.warn(f"The shared cache at {self.url} is not available, only in-memory caches are used: {exc}")
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """
+        Looks up a non-expired entry.
+
+        :param namespace: The namespace of the entry, i.e. the name of the cache.
+        :param key: The key of the entry.
+
+        :return: The value and its expiry timestamp, or None if no valid entry exists or the server is not reachable.
+        """
+        try:
+            payload = self._client.get(self._key(namespace, key))
+        except self._errors as exc:
+            self._unavailable(exc)
+            return None
+        if payload is None:
+            return None
+        expires_at, value = SQLiteCacheStore._decode(payload)
+        return value, expires_at
+
+    def set(self, namespace: str, key: str, value: Any, expires_at: Optional[float]) -> None:
+        """
+        Inserts or replaces an entry.
+
+        :param namespace: The namespace of the entry, i.e. the name of the cache.
+        :param key: The key of the entry.
+        :param value: The JSON compatible value to store.
+        :param expires_at: The timestamp after which the entry expires, or None if it never expires.
+        """
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            return
+        payload = SQLiteCacheStore._encode([expires_at, value])
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            pipeline.set(self._key(namespace, key), payload,
+                         px=None if expires_at is None else int((expires_at - now) * 1000) + 1)
+            pipeline.zadd(self._written_key(namespace), {key: now})
+            pipeline.execute()
+        except self._errors as exc:
+            self._unavailable(exc)
+
+    def delete(self, namespace: str, key: Optional[str] = None) -> None:
+        """
+        Removes a single entry or, if no key is given, all entries of a namespace.
+
+        :param namespace: The namespace of the entries, i.e. the name of the cache.
+        :param key: The key of the entry to remove.
+        """
+        try:
+            if key is not None:
+                self._client.delete(self._key(namespace, key))
+                self._client.zrem(self._written_key(namespace), key)
+                return
+            keys = [self._key(namespace, member.decode("utf-8"))
+                    for member in self._client.zrange(self._written_key(namespace), 0, -1)]
+            for start in range(0, len(keys), 1000):
+                self._client.delete(*keys[start:start + 1000])
+            self._client.delete(self._written_key(namespace))
+        except self._errors as exc:
+            self._unavailable(exc)
+
+    def items(self, namespace: str, limit: int) -> Iterator[Tuple[str, Any, Optional[float]]]:
+        """
+        Iterates over the non-expired entries of a namespace, most recently written first.
+        Keys of expired entries are removed from the write order on the way.
+
+        :param namespace: The namespace of the entries, i.e. the name of the cache.
+        :param limit: The maximum number of entries.
+
+        :return: An iterator of keys, values and expiry timestamps.
+        """
+        try:
+            keys = [member.decode("utf-8")
+                    for member in self._client.zrevrange(self._written_key(namespace), 0, limit - 1)]
+        except self._errors as exc:
+            self._unavailable(exc)
+            return
+        # The values are fetched in pages, so only the consumed entries are held in memory
+        for start in range(0, len(keys), 100):
+            page = keys[start:start + 100]
+            try:
+                payloads = self._client.mget([self._key(namespace, key) for key in page])
+                expired = [key for key, payload in zip(page, payloads) if payload is None]
+                if expired:
+                    self._client.zrem(self._written_key(namespace), *expired)
+            except self._errors as exc:
+                self._unavailable(exc)
+                return
+            for key, payload in zip(page, payloads):
+                if payload is not None:
+                    expires_at, value = SQLiteCacheStore._decode(payload)
+                    yield key, value, expires_at
+
+    def close(self) -> None:
+        """Closes the connections to the server."""
+        self._client.close()
+
+
+def open_cache_store(url: str = "", path: str = "", max_bytes: Optional[int] = None) -> Optional[CacheStore]:
+    """
+    Opens the store backing the in-memory caches. A shared store is preferred over a local SQLite database.
+    If the optional redis package required by a shared store is missing, the local database is used instead.
+
+    :param url: URL of a Redis compatible server, e.g. "redis://localhost:6379/0". Not used if empty.
+    :param path: File path of a local SQLite database. Not used if empty.
+    :param max_bytes: Maximum total size of the stored compressed values in the local database.
+
+    :return: The store, or None if neither is configured and only in-memory caches are used.
+    """
+    if url:
+        try:
+            return RedisCacheStore(url)
+        except ImportError:
+            warnings.warn(f"The redis package is required for the shared cache at {url}, falling back to local caches")
+    if path:
+        return SQLiteCacheStore(path=path, max_bytes=max_bytes)
+    return None
+
+
+class TTLCache:
+    """
+    Thread-safe least-recently-used cache whose entries expire after a fixed time-to-live.
+    Besides the number of entries, the cache can be bounded by the total size of its values.
+    Optionally, entries are written through to a persistent store which is consulted on cache misses.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            max_entries: int,
+            ttl: Optional[float] = None,
+            max_bytes: Optional[int] = None,
+            sizeof: Optional[Callable[[Any], int]] = None,
+            store: Optional[CacheStore] = None,
+            clock: Callable[[], float] = time.time):
+        """
+        :param name: Name of the cache, used to identify it in statistics.
+        :param max_entries: Maximum number of entries before the least recently used entry is evicted.
+        :param ttl: Time-to-live of an entry in seconds. Entries never expire if None or not positive.
+        :param max_bytes: Maximum total size of all values as computed by sizeof. Not limited if None or not positive.
+        :param sizeof: Function computing the size of a value in bytes. Required if max_bytes is set.
+        :param store: Persistent or shared store backing the cache. Values must be JSON compatible if set.
+        :param clock: Function returning the current time in seconds.
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self.max_bytes = max_bytes if max_bytes and max_bytes > 0 else None
+        if self.max_bytes is not None and sizeof is None:
+            raise ValueError("A sizeof function is required to bound the cache by bytes")
+        self.sizeof = sizeof
+        self.store = store
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Looks up a non-expired entry and marks it as most recently used.
+
+        :param key: The key of the entry.
+        :param default: The value returned if no valid entry exists.
+
+        :return: The cached value or the default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, size = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                del self._entries[key]
+                self._total_bytes -= size
+                self.stats.expirations += 1
+
+        stored = self.store.get(self.name, key) if self.store is not None else None
+        if stored is None:
+            with self._lock:
+                self.stats.misses += 1
+            return default
+        value, expires_at = stored
+        self._insert(key, value, expires_at)
+        with self._lock:
+            self.stats.hits += 1
+            self.stats.store_hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Inserts or replaces an entry, evicting the least recently used entries if the cache is full.
+        Values larger than the byte limit of the whole cache are not cached.
+
+        :param key: The key of the entry.
+        :param value: The value to cache.
+        """
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        self._insert(key, value, expires_at)
+        if self.store is not None:
+            self.store.set(self.name, key, value, expires_at)
+
+    def touch(self, key: str, value: Any) -> bool:
+        """
+        Replaces the value of an in-memory entry by a value of the same size, e.g. with updated bookkeeping fields.
+        Unlike set, the entry keeps its expiry timestamp and is not written to the store, so the store is not rewritten
+        for changes that only matter to this process.
+
+        :param key: The key of the entry.
+        :param value: The new value, whose size must equal the size of the cached value.
+
+        :return: Whether a non-expired entry was replaced.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            _, expires_at, size = entry
+            if expires_at is not None and expires_at <= self._clock():
+                return False
+            self._entries[key] = (value, expires_at, size)
+            return True
+
+    def warm_load(self) -> int:
+        """
+        Fills the in-memory cache with the most recently written entries of the persistent store.
+        The entries are read most recently written first and appended as least recently used, so that the most
+        recently written entries are evicted last. Loading stops once the cache is full, so no more entries are read
+        and decoded than the cache can hold.
+
+        :return: The number of loaded entries.
+        """
+        if self.store is None or self.max_entries <= 0:
+            return 0
+        loaded = 0
+        for key, value, expires_at in self.store.items(self.name, limit=self.max_entries):
+            size = self.sizeof(value) if self.sizeof is not None else 0
+            if self.max_bytes is not None and size > self.max_bytes:
+                continue
+            with self._lock:
+                if len(self._entries) >= self.max_entries or (
+                        self.max_bytes is not None and self._total_bytes + size > self.max_bytes):
+                    break
+                if key in self._entries:
+                    # Written or loaded from the store by a request in the meantime, which is at least as recent
+                    continue
+                self._entries[key] = (value, expires_at, size)
+                self._entries.move_to_end(key, last=False)
+                self._total_bytes += size
+            loaded += 1
+        return loaded
+
+    def _insert(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        """
+        Inserts or replaces an in-memory entry and evicts entries exceeding the limits.
+
+        :param key: The key of the entry.
+        :param value: The value to cache.
+        :param expires_at: The timestamp after which the entry expires, or None if it never expires.
+        """
+        if self.max_entries <= 0:
+            return
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = (value, expires_at, size)
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self._total_bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self.stats.evictions += 1
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Removes a single entry or, if no key is given, all entries from the cache.
+
+        :param key: The key of the entry to remove.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._total_bytes = 0
+            else:
+                self._remove(key)
+        if self.store is not None:
+            self.store.delete(self.name, key)
+
+    def _remove(self, key: str) -> None:
+        """
+        Removes an entry and releases its size. The caller must hold the lock.
+
+        :param key: The key of the entry.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Summarizes the size and the counters of the cache.
+
+        :return: A dictionary containing the statistics of the cache.
+        """
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "expirations": self.stats.expirations,
+            "storeHits": self.stats.store_hits,
+            "hitRatio": round(self.stats.hit_ratio, 4),
+        }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls. While a call for a key is in flight, further callers with the same key
+    do not start their own call but wait for the running one and receive the same result or exception.
+    """
+
+    def __init__(self):
+        self.shared_calls = 0
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """
+        Executes the function unless a call with the same key is already in flight.
+
+        :param key: The key identifying identical calls.
+        :param func: The function to execute.
+
+        :return: The result of the function, possibly computed by a concurrent caller.
+        :raises Exception: The exception raised by the function, possibly in a concurrent caller.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.shared_calls += 1
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Summarizes the number of calls in flight and the number of calls served by a concurrent call.
+
+        :return: A dictionary containing the statistics.
+        """
+        return {"inFlight": len(self._calls), "sharedCalls": self.shared_calls}
@@ -0,0 +1,245 @@
+"""This module contains the local search index of the Dataland companies used for fuzzy company name matching."""
+
+import re
+import threading
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# Legal forms ignored when matching company names, so that "BASF" matches "BASF SE"
+LEGAL_FORMS = frozenset({
+    "ab", "ag", "aktiengesellschaft", "asa", "bv", "co", "corp", "corporation", "inc", "incorporated", "kg", "kgaa", "limited", "llc",
+    "ltd", "nv", "oyj", "plc", "sa", "sas", "se", "spa", "gmbh", "company",
+})
+LEI_PATTERN = re.compile(r"^[0-9A-Z]{18}[0-9]{2}$")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalizes a company name for matching by ignoring case, punctuation and legal forms.
+
+    :param name: The name of the company, e.g. "BASF SE".
+
+    :return: The normalized name, e.g. "basf".
+    """
+    tokens = re.sub(r"[^\w]+", " ", name.casefold()).split()
+    core = [token for token in tokens if token not in LEGAL_FORMS]
+    return " ".join(core or tokens)
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    :param text: A normalized company name.
+
+    :return: The character trigrams of the padded text, used to find candidate matches.
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def score_match(query: str, name: str) -> float:
+    """
+    Scores the similarity of two normalized company names between 0 and 1.
+    Names starting with the query score at least 0.8, increasing with the share of the name covered by the query.
+
+    :param query: The normalized query, e.g. "deutsche ban".
+    :param name: The normalized company name, e.g. "deutsche bank".
+
+    :return: The similarity score, 1 for identical names.
+    """
+    if query == name:
+        return 1.0
+    score = SequenceMatcher(None, query, name).ratio()
+    if name.startswith(query):
+        score = max(score, 0.8 + 0.2 * len(query) / len(name))
+    return min(score, 0.99)
+
+
+class CompanyIndex:
+    """
+    In-memory search index of all Dataland companies, supporting fuzzy and prefix matching of company names and
+    exact matching of LEIs. The index is loaded chunk by chunk from the Dataland company search on a background thread
+    and refreshed periodically. Companies are updated in place while a refresh runs, so the index can be queried
+    during the initial load and removed companies are dropped once a refresh has completed.
+    """
+
+    def __init__(self, loader: Callable[[int, int], List[Dict[str, Any]]], chunk_size: int, refresh_interval: float):
+        """
+        :param loader: Function returning the companies of a chunk given the chunk index and size, as dictionaries
+        containing at least "companyId" and "companyName".
+        :param chunk_size: Number of companies requested per chunk.
+        :param refresh_interval: Time in seconds between two refreshes of the index.
+        """
+        self.loader = loader
+        self.chunk_size = chunk_size
+        self.refresh_interval = refresh_interval
+        self.loaded_at: Optional[float] = None
+        self.last_refresh_duration: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._companies: Dict[str, Dict[str, Any]] = {}
+        self._names: Dict[str, str] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._by_lei: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the index has been loaded completely at least once."""
+        return self.loaded_at is not None
+
+    def start(self) -> None:
+        """Starts loading and refreshing the index on a daemon thread, the first load starts immediately."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dataland-company-index", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops refreshing the index after the currently requested chunk."""
+        self._stop.set()
+        self._thread = None
+
+    def refresh(self) -> None:
+        """
+        Loads all companies chunk by chunk and updates the index.
+
+        :raises Exception: If a chunk could not be loaded. Already loaded companies are kept in the index.
+        """
+        start = time.perf_counter()
+        seen: Set[str] = set()
+        chunk_index = 0
+        while True:
+            if self._stop.is_set():
+                return
+            chunk = self.loader(chunk_index, self.chunk_size)
+            for company in chunk:
+                self.upsert(company)
+                seen.add(company["companyId"])
+            if len(chunk) < self.chunk_size:
+                break
+            chunk_index += 1
+        with self._lock:
+            for company_id in set(self._companies) - seen:
+                self._remove(company_id)
+        self.loaded_at = time.time()
+        self.last_refresh_duration = time.perf_counter() - start
+
+    def upsert(self, company: Dict[str, Any]) -> None:
+        """
+        Adds a company to the index or updates it.
+
+        :param company: The company as returned by the Dataland company search, e.g.
+        {"companyId": ..., "companyName": "BASF SE", "lei": ..., "countryCode": "DE", ...}.
+        """
+        company_id = company["companyId"]
+        name = normalize_name(company.get("companyName") or "")
+        with self._lock:
+            if company_id in self._companies:
+                if self._companies[company_id] == company:
+                    return
+                self._remove(company_id)
+            self._companies[company_id] = company
+            self._names[company_id] = name
+            for trigram in trigrams(name):
+                self._postings.setdefault(trigram, set()).add(company_id)
+            if company.get("lei"):
+                self._by_lei[company["lei"].upper()] = company_id
+
+    def _remove(self, company_id: str) -> None:
+        """Removes a company from the index. The lock must be held by the caller."""
+        company = self._companies.pop(company_id)
+        for trigram in trigrams(self._names.pop(company_id)):
+            postings = self._postings.get(trigram)
+            if postings is not None:
+                postings.discard(company_id)
+                if not postings:
+                    del self._postings[trigram]
+        if company.get("lei") and self._by_lei.get(company["lei"].upper()) == company_id:
+            del self._by_lei[company["lei"].upper()]
+
+    def get(self, company_id: str) -> Optional[Dict[str, Any]]:
+        """
+        :param company_id: The unique identifier of a company used in Dataland.
+
+        :return: The indexed company, or None if the company is not indexed.
+        """
+        with self._lock:
+            return self._companies.get(company_id)
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Searches the companies best matching a company name or LEI.
+
+        :param query: The company name, a part or misspelling of it, or an LEI, e.g. "BASF" or "Allainz".
+        :param limit: The maximum number of returned candidates.
+
+        :return: The candidates ordered by decreasing match score, each being the indexed company with an
+        additional "score" between 0 and 1.
+        """
+        lei = query.strip().upper()
+        normalized = normalize_name(query)
+        with self._lock:
+            if LEI_PATTERN.match(lei) and lei in self._by_lei:
+                return [{**self._companies[self._by_lei[lei]], "score": 1.0}]
+            if not normalized:
+                return []
+            counts: Counter = Counter()
+            for trigram in trigrams(normalized):
+                counts.update(self._postings.get(trigram, ()))
+            candidates = [
+                (score_match(normalized, self._names[company_id]), company_id)
+                for company_id, _ in counts.most_common(max(limit, 1) * 20)
+            ]
+            candidates.sort(key=lambda candidate: (-candidate[0], len(self._names[candidate[1]])))
+            return [
+                {**self._companies[company_id], "score": round(score, 3)}
+                for score, company_id in candidates[:limit]
+            ]
+
+    def lookup(self, query: str, threshold: float, margin: float = 0.05) -> Optional[Dict[str, Any]]:
+        """
+        Finds the company unambiguously matching a company name or LEI.
+
+        :param query: The company name or LEI, e.g. "BASF SE".
+        :param threshold: The minimum match score of the company.
+        :param margin: The minimum difference to the match score of the next best company.
+
+        :return: The indexed company if a single company matches well enough, otherwise None.
+        """
+        candidates = self.search(query, limit=2)
+        if not candidates or candidates[0]["score"] < threshold:
+            return None
+        if len(candidates) > 1 and candidates[0]["score"] - candidates[1]["score"] < margin:
+            return None
+        best = dict(candidates[0])
+        del best["score"]
+        return best
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        :return: The readiness, the number of indexed companies, the time and duration of the last complete load
+        and the last error of the index.
+        """
+        return {
+            "ready": self.is_ready,
+            "companies": len(self._companies),
+            "loadedAt": self.loaded_at,
+            "lastRefreshSeconds": None if self.last_refresh_duration is None else round(self.last_refresh_duration, 1),
+            "lastError": self.last_error,
+        }
+
+    def _run(self) -> None:
+        """Refreshes the index until stopped, retrying a failed load after a tenth of the refresh interval."""
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as exc:
+                self.last_error = str(exc) or type(exc).__name__
+                self._stop.wait(self.refresh_interval / 10)
+            else:
+                self.last_error = None
+                self._stop.wait(self.refresh_interval)
@@ -3,39 +3,204 @@
 from __future__ import annotations
 
 import dataclasses
+import importlib
 import os
+import socket
+import threading
 import warnings
-from urllib.parse import urljoin
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urljoin, urlsplit
 
-import dataland_backend
-import dataland_community
-import dataland_documents
-import dataland_qa
-import dataland_users
+from urllib3.connection import HTTPConnection
+
+from settings import ServerSettings
+from tracing import TRACER
+
+if TYPE_CHECKING:
+    import dataland_backend
+    import dataland_community
+    import dataland_documents
+    import dataland_qa
+    import dataland_users
 
 _global_client: DatalandClient | None = None
 
+# Maps each Dataland service to its generated client package and the URL path it is served under.
+# The packages are large and therefore only imported when the first API of a service is accessed.
+_SERVICES = {
+    "backend": ("dataland_backend", "api"),
+    "documents": ("dataland_documents", "documents"),
+    "qa": ("dataland_qa", "qa"),
+    "community": ("dataland_community", "community"),
+    "users": ("dataland_users", "users"),
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class ConnectionSettings:
+    """Settings of the connection pools shared by all API calls of a DatalandClient.
+
+    Attributes:
+        pool_maxsize: The maximum number of connections kept open per Dataland service.
+        keep_alive: Whether TCP keep-alive probes are enabled on pooled connections.
+        connect_timeout: Timeout in seconds for establishing a connection.
+        read_timeout: Timeout in seconds for reading a response.
+    """
+
+    pool_maxsize: int = 16
+    keep_alive: bool = True
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+
+    @classmethod
+    def from_env(cls) -> ConnectionSettings:
+        """Creates the connection settings from the DATALAND_MCP_* environment variables of the server settings."""
+        return cls.from_server_settings(ServerSettings.from_env())
+
+    @classmethod
+    def from_server_settings(cls, settings: ServerSettings) -> ConnectionSettings:
+        """Creates the connection settings from the corresponding fields of the server settings.
+
+        Args:
+            settings: The server settings.
+
+        Returns:
+            The connection settings.
+        """
+        return cls(
+            pool_maxsize=settings.pool_maxsize,
+            keep_alive=settings.keep_alive,
+            connect_timeout=settings.connect_timeout,
+            read_timeout=settings.read_timeout,
+        )
+
+    @property
+    def request_timeout(self) -> tuple[float, float]:
+        """The (connect, read) timeout tuple as expected by the generated API clients."""
+        return self.connect_timeout, self.read_timeout
+
 
 class DatalandClient:  # noqa: PLR0904
     """Provides an intuitive accessor for authenticated dataland API Instances.
 
+    One ApiClient, and thereby one connection pool, is created lazily per Dataland service and reused for all
+    subsequent API calls. The pools are released by calling close() or by using the client as a context manager.
+
     Attributes:
         dataland_url (str): The Dataland URL determined by the is_test_dataland switch.
         api_key (str): The API Key to use for authenticating against dataland.
+        connection_settings (ConnectionSettings): The pool size, keep-alive and timeout settings of the connections.
     """
 
     dataland_url: str
     api_key: str
+    connection_settings: ConnectionSettings
 
-    def __init__(self, dataland_url: str, api_key: str) -> None:
+    def __init__(
+        self, dataland_url: str, api_key: str, connection_settings: ConnectionSettings | None = None
+    ) -> None:
         """Create a new DatalandClient.
 
         Args:
             dataland_url: The URL of the dataland instance to connect to.
             api_key: The API Key to use for authenticating against dataland.
+            connection_settings: The connection pool settings. Defaults to the settings from the environment.
         """
         self.dataland_url = dataland_url
         self.api_key = api_key
+        self.connection_settings = connection_settings or ConnectionSettings.from_env()
+        self._api_clients: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> DatalandClient:
+        """Enter the runtime context of the client."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close all connection pools when leaving the runtime context."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection pools of all API clients created so far.
+
+        The client stays usable afterward; new API calls lazily create fresh pools.
+        """
+        with self._lock:
+            api_clients = list(self._api_clients.values())
+            self._api_clients.clear()
+        for api_client in api_clients:
+            api_client.rest_client.pool_manager.clear()
+
+    def get_pool_stats(self) -> dict[str, dict[str, int]]:
+        """Summarizes the usage of the connection pools of all API clients created so far.
+
+        Returns:
+            Per service, the maximum number of pooled connections and the number of connections currently in use.
+        """
+        with self._lock:
+            api_clients = dict(self._api_clients)
+        pool_stats = {}
+        for service, api_client in api_clients.items():
+            pools = api_client.rest_client.pool_manager.pools
+            max_connections = in_use = 0
+            for key in pools.keys():
+                connection_queue = getattr(pools.get(key), "pool", None)
+                if connection_queue is not None:
+                    max_connections += connection_queue.maxsize
+                    in_use += connection_queue.maxsize - connection_queue.qsize()
+            pool_stats[service] = {"maxConnections": max_connections, "connectionsInUse": in_use}
+        return pool_stats
+
+    def _api(self, service: str, controller: str) -> Any:  # noqa: ANN401
+        """Creates a controller API of the given Dataland service using the shared ApiClient of the service."""
+        package = importlib.import_module(_SERVICES[service][0])
+        return getattr(package, controller)(self._api_client(service))
+
+    def _api_client(self, service: str) -> Any:  # noqa: ANN401
+        """Retrieves the shared ApiClient of the given Dataland service, creating it on first use."""
+        api_client = self._api_clients.get(service)
+        if api_client is not None:
+            return api_client
+        with self._lock:
+            if service not in self._api_clients:
+                self._api_clients[service] = self._create_api_client(service)
+            return self._api_clients[service]
+
+    def _create_api_client(self, service: str) -> Any:  # noqa: ANN401
+        """Creates a new ApiClient with a configured connection pool for the given Dataland service."""
+        package_name, path = _SERVICES[service]
+        package = importlib.import_module(package_name)
+        config = package.Configuration(access_token=self.api_key, host=urljoin(self.dataland_url, path))
+        config.connection_pool_maxsize = self.connection_settings.pool_maxsize
+        if self.connection_settings.keep_alive:
+            config.socket_options = [
+                *HTTPConnection.default_socket_options,
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            ]
+        api_client = package.ApiClient(config)
+
+        # The generated clients only apply a timeout if one is passed to each API call explicitly,
+        # so the configured timeouts are used as default for all calls made through this client.
+        # Each request is recorded as tracing span including the download of the response body. The generated clients
+        # read the body before deserializing it anyway, the read body is kept by the response.
+        request = api_client.rest_client.request
+        request_timeout = self.connection_settings.request_timeout
+
+        def request_with_default_timeout(
+            method: str, url: str, *args: Any, _request_timeout: Any = None, **kwargs: Any  # noqa: ANN401
+        ) -> Any:  # noqa: ANN401
+            attributes = {"http.request.method": method, "url.path": urlsplit(url).path}
+            with TRACER.span(f"http {method}", **attributes) as span:
+                response = request(method, url, *args, _request_timeout=_request_timeout or request_timeout, **kwargs)
+                if span is not None:
+                    span.set_attribute("http.response.status_code", response.status)
+                    body = response.read()
+                    if body is not None:
+                        span.set_attribute("http.response.body.size", len(body))
+                return response
+
+        api_client.rest_client.request = request_with_default_timeout
+        return api_client
 
     @staticmethod
     def get_global_client() -> DatalandClient:
@@ -63,111 +228,102 @@ class DatalandClient:  # noqa: PLR0904
     @property
     def backend_client(self) -> dataland_backend.ApiClient:
         """Retrieves the client for accessing the backend API."""
-        config = dataland_backend.Configuration(access_token=self.api_key, host=urljoin(self.dataland_url, "api"))
-        return dataland_backend.ApiClient(config)
+        return self._api_client("backend")
 
     @property
     def company_api(self) -> dataland_backend.CompanyDataControllerApi:
         """Function to run the company-data-controller API."""
-        return dataland_backend.CompanyDataControllerApi(self.backend_client)
+        return self._api("backend", "CompanyDataControllerApi")
 
     @property
     def documents_client(self) -> dataland_documents.ApiClient:
         """Retrieves the client for accessing the documents API."""
-        config = dataland_documents.Configuration(
-            access_token=self.api_key, host=urljoin(self.dataland_url, "documents")
-        )
-        return dataland_documents.ApiClient(config)
+        return self._api_client("documents")
 
     @property
     def documents_api(self) -> dataland_documents.DocumentControllerApi:
         """Function to run the document-controller API."""
-        return dataland_documents.DocumentControllerApi(self.documents_client)
+        return self._api("documents", "DocumentControllerApi")
 
     @property
     def datapoint_api(self) -> dataland_backend.DataPointControllerApi:
         """Funtion to run the data-point-controller API."""
-        return dataland_backend.DataPointControllerApi(self.backend_client)
+        return self._api("backend", "DataPointControllerApi")
 
     @property
     def sfdr_api(self) -> dataland_backend.SfdrDataControllerApi:
         """Function to run the sfdr-data-controller API."""
-        return dataland_backend.SfdrDataControllerApi(self.backend_client)
+        return self._api("backend", "SfdrDataControllerApi")
 
     @property
     def eu_taxonomy_nf_api(self) -> dataland_backend.EutaxonomyNonFinancialsDataControllerApi:
         """Function to run the eu-taxonomy-non-financials-data-controller API."""
-        return dataland_backend.EutaxonomyNonFinancialsDataControllerApi(self.backend_client)
+        return self._api("backend", "EutaxonomyNonFinancialsDataControllerApi")
 
     @property
     def eu_taxonomy_fin_api(self) -> dataland_backend.EutaxonomyFinancialsDataControllerApi:
         """Function to run the eu-taxonomy-non-financials-data-controller API."""
-        return dataland_backend.EutaxonomyFinancialsDataControllerApi(self.backend_client)
+        return self._api("backend", "EutaxonomyFinancialsDataControllerApi")
 
     @property
     def eu_taxonomy_nuclear_gas_api(self) -> dataland_backend.NuclearAndGasDataControllerApi:
         """Function to run the eu-taxonomy-nuclear-and-gas-data-controller API."""
-        return dataland_backend.NuclearAndGasDataControllerApi(self.backend_client)
+        return self._api("backend", "NuclearAndGasDataControllerApi")
 
     @property
     def meta_api(self) -> dataland_backend.MetaDataControllerApi:
         """Function to run the meta-data-controller API."""
-        return dataland_backend.MetaDataControllerApi(self.backend_client)
+        return self._api("backend", "MetaDataControllerApi")
 
     @property
     def qa_client(self) -> dataland_qa.ApiClient:
         """Retrieves the client for accessing the qa API."""
-        config = dataland_qa.Configuration(access_token=self.api_key, host=urljoin(self.dataland_url, "qa"))
-        return dataland_qa.ApiClient(config)
+        return self._api_client("qa")
 
     @property
     def community_client(self) -> dataland_community.ApiClient:
         """Retrieves the client for accessing the community API."""
-        config = dataland_community.Configuration(
-            access_token=self.api_key, host=urljoin(self.dataland_url, "community")
-        )
-        return dataland_community.ApiClient(config)
+        return self._api_client("community")
 
     @property
     def users_client(self) -> dataland_users.ApiClient:
         """Retrieves the client for accessing the users API."""
-        config = dataland_users.Configuration(access_token=self.api_key, host=urljoin(self.dataland_url, "users"))
-        return dataland_users.ApiClient(config)
+        return self._api_client("users")
 
     @property
     def qa_api(self) -> dataland_qa.QaControllerApi:
         """Function to run the qa-controller API."""
-        return dataland_qa.QaControllerApi(self.qa_client)
+        return self._api("qa", "QaControllerApi")
 
     @property
     def data_point_qa_api(self) -> dataland_qa.DataPointQaReportControllerApi:
         """Function to run the data-point-qa-controller API."""
-        return dataland_qa.DataPointQaReportControllerApi(self.qa_client)
+        return self._api("qa", "DataPointQaReportControllerApi")
 
     @property
     def sfdr_qa_api(self) -> dataland_qa.SfdrDataQaReportControllerApi:
         """Function to run the QA report controller for SFDR."""
-        return dataland_qa.SfdrDataQaReportControllerApi(self.qa_client)
+        return self._api("qa", "SfdrDataQaReportControllerApi")
 
     @property
     def eu_taxonomy_nf_qa_api(self) -> dataland_qa.EutaxonomyNonFinancialsDataQaReportControllerApi:
         """Function to run the QA report controller for EU Taxonomy non-financials."""
-        return dataland_qa.EutaxonomyNonFinancialsDataQaReportControllerApi(self.qa_client)
+        return self._api("qa", "EutaxonomyNonFinancialsDataQaReportControllerApi")
 
     @property
     def eu_taxonomy_fin_qa_api(self) -> dataland_qa.EutaxonomyFinancialsDataQaReportControllerApi:
         """Function to run the QA report controller for EU Taxonomy financials."""
-        return dataland_qa.EutaxonomyFinancialsDataQaReportControllerApi(self.qa_client)
+        return self._api("qa", "EutaxonomyFinancialsDataQaReportControllerApi")
 
     @property
     def request_api(self) -> dataland_community.RequestControllerApi:
         """Function to run the request controller API."""
-        return dataland_community.RequestControllerApi(self.community_client)
+        return self._api("community", "RequestControllerApi")
 
     @property
     def portfolio_api(self) -> dataland_users.PortfolioControllerApi:
         """Function to run the portfolio controller API."""
-        return dataland_users.PortfolioControllerApi(self.users_client)
+        return self._api("users", "PortfolioControllerApi")
 
 
 @dataclasses.dataclass(frozen=True)
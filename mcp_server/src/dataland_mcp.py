@@ -3,8 +3,13 @@
 __version__ = "0.0.1"
 
 import argparse
-from server import DatalandMCPServer
-from dataland_client import PRODUCTION_INSTANCE, DatalandClient
+import importlib
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
 
 def main() -> None:
     # Pass arguments to define transport type (e.g. stdio, streamable-http), etc.
@@ -17,14 +22,122 @@ def main() -> None:
     )
     parser.add_argument("--host", dest="host", default=None)
     parser.add_argument("--port", dest="port", type=int, default=None)
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        default=None,
+        help="Number of worker processes serving the streamable-http transport (default: DATALAND_MCP_HTTP_WORKERS or 1)"
+    )
+    parser.add_argument(
+        "--startup-timing",
+        dest="startup_timing",
+        action="store_true",
+        help="Report the duration of the startup phases to stderr and exit without serving"
+    )
     args = parser.parse_args()
 
-    # Initialize DatalandClient
+    if args.transport in {"http", "streamable-http"} and not args.startup_timing:
+        from settings import ServerSettings
+        workers = args.workers if args.workers is not None else ServerSettings.from_env().http_workers
+        if workers > 1:
+            run_workers(args.host, args.port, workers)
+            return
+
+    # The server modules are imported here, so that the duration of the imports can be reported
+    timings = []
+    start = time.perf_counter()
+    from server import DatalandMCPServer
+    from dataland_client import PRODUCTION_INSTANCE, DatalandClient
+    timings.append(("import server modules", time.perf_counter() - start))
+
+    # Initialize DatalandClient, its connection pools are closed when the server shuts down
+    start = time.perf_counter()
+    DatalandClient.set_global_client(PRODUCTION_INSTANCE.client)
+    with DatalandClient.get_global_client() as client:
+        timings.append(("create Dataland client", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        dataland_mcp = DatalandMCPServer(client)
+        timings.append(("create MCP server", time.perf_counter() - start))
+
+        if args.startup_timing:
+            report_startup_timing(timings)
+            return
+        dataland_mcp.run(args.transport, args.host, args.port)
+
+
+def run_workers(host: Optional[str], port: Optional[int], workers: int) -> None:
+    """
+    Serves the streamable-http transport with multiple worker processes sharing the listening socket.
+    Every worker creates its own Dataland client and MCP server via create_app.
+    The number of workers is passed to the workers via the environment, so that they divide the limits of the server.
+
+    :param host: Host of URL, the FastMCP default if None.
+    :param port: Port of URL, the FastMCP default if None.
+    :param workers: Number of worker processes.
+    """
+    import fastmcp
+    import uvicorn
+
+    os.environ["DATALAND_MCP_HTTP_WORKERS"] = str(workers)
+    uvicorn.run(
+        "dataland_mcp:create_app",
+        factory=True,
+        host=host or fastmcp.settings.host,
+        port=port or fastmcp.settings.port,
+        workers=workers,
+    )
+
+
+def create_app():
+    """
+    Creates the ASGI application of a worker process in the multi-worker mode.
+    The rate limit and the report cache size are divided among the workers, and the connection pools of the Dataland
+    client are closed when the worker shuts down.
+
+    :return: The stateless streamable-http application of a new MCP server.
+    """
+    from server import DatalandMCPServer
+    from dataland_client import PRODUCTION_INSTANCE, DatalandClient
+    from settings import ServerSettings
+
+    settings = ServerSettings.from_env()
     DatalandClient.set_global_client(PRODUCTION_INSTANCE.client)
     client = DatalandClient.get_global_client()
+    app = DatalandMCPServer(client, settings.per_worker(settings.http_workers)).http_app()
+    server_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(starlette_app):
+        try:
+            async with server_lifespan(starlette_app):
+                yield
+        finally:
+            client.close()
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+def report_startup_timing(timings: list) -> None:
+    """
+    Prints the duration of the startup phases to stderr, so that the stdio transport is not disturbed.
+    Additionally, the import of the generated Dataland backend client is timed, which is deferred to the first tool call.
+
+    :param timings: The names and durations in seconds of the startup phases.
+    """
+    start = time.perf_counter()
+    importlib.import_module("dataland_backend")
+    deferred = [("import dataland_backend (deferred to first tool call)", time.perf_counter() - start)]
+
+    print("Startup timing of the Dataland MCP server:", file=sys.stderr)
+    for phase, duration in timings:
+        print(f"  {phase:<55} {duration * 1000:9.1f} ms", file=sys.stderr)
+    print(f"  {'total until ready to serve':<55} {sum(d for _, d in timings) * 1000:9.1f} ms", file=sys.stderr)
+    for phase, duration in deferred:
+        print(f"  {phase:<55} {duration * 1000:9.1f} ms", file=sys.stderr)
 
-    dataland_mcp = DatalandMCPServer(client)
-    dataland_mcp.run(args.transport, args.host, args.port)
 
 if __name__ == "__main__":
     main()
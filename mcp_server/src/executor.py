@@ -0,0 +1,59 @@
+"""This module contains the executor which runs the blocking Dataland calls of the tools off the event loop."""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class ToolExecutor:
+    """
+    Runs blocking tool functions on a bounded thread pool, so that a slow Dataland request of one MCP session
+    does not stall the event loop serving all other sessions.
+    """
+
+    def __init__(self, max_workers: int, timeout: Optional[float] = None):
+        """
+        :param max_workers: Maximum number of tool functions executed concurrently. Further calls are queued.
+        :param timeout: Maximum time in seconds a tool call may take including queueing. No limit if None or not positive.
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.active_calls = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dataland-tool")
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Executes a blocking function on the thread pool and awaits its result.
+        The function runs in a copy of the current context, so that it is traced as part of the calling tool.
+
+        :param func: The blocking function to execute.
+        :param args: Positional arguments passed to the function.
+        :param kwargs: Keyword arguments passed to the function.
+
+        :return: The return value of the function.
+        :raises TimeoutError: If the function did not finish within the configured timeout.
+        """
+        context = contextvars.copy_context()
+        future = self._pool.submit(functools.partial(context.run, func, *args, **kwargs))
+        # A call counts as active until its worker thread finishes, even if the caller stopped waiting for it
+        with self._lock:
+            self.active_calls += 1
+        future.add_done_callback(self._on_call_done)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # The worker thread cannot be interrupted, its result is discarded once it finishes.
+            raise TimeoutError(f"The request to Dataland did not finish within {self.timeout:g} seconds") from None
+
+    def _on_call_done(self, future: Future) -> None:
+        """Counts a call as finished once its worker thread has finished or the queued call was cancelled."""
+        with self._lock:
+            self.active_calls -= 1
+
+    def shutdown(self) -> None:
+        """Stops accepting new calls and cancels all calls that have not started yet."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,82 @@
+"""This module contains the background probe checking the connectivity to Dataland for the readiness route."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class UpstreamProbe:
+    """
+    Periodically performs a cheap Dataland request on a background thread and keeps the outcome,
+    so that readiness checks can report the upstream connectivity without performing a request themselves.
+    """
+
+    def __init__(self, probe: Callable[[], Any], interval: float):
+        """
+        :param probe: Function performing the Dataland request, which raises an exception on failure.
+        :param interval: Time in seconds between two probes.
+        """
+        self.probe = probe
+        self.interval = interval
+        self.last_checked_at: Optional[float] = None
+        self.last_success_at: Optional[float] = None
+        self.last_latency: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts probing on a daemon thread, the first probe is performed immediately."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="dataland-upstream-probe", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops probing after the currently running probe."""
+        self._stop.set()
+        self._thread = None
+
+    def check(self) -> None:
+        """Performs a single probe and records its outcome."""
+        start = time.perf_counter()
+        try:
+            self.probe()
+        except Exception as exc:
+            self.last_error = str(exc) or type(exc).__name__
+        else:
+            self.last_error = None
+            self.last_success_at = time.time()
+        finally:
+            self.last_latency = time.perf_counter() - start
+            self.last_checked_at = time.time()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the most recent probe succeeded and is recent enough to be trusted."""
+        return (
+            self.last_error is None
+            and self.last_success_at is not None
+            and time.time() - self.last_success_at <= 3 * self.interval
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Summarizes the outcome of the most recent probe.
+
+        :return: A dictionary containing the readiness, the time and latency of the last probe and the last error.
+        """
+        return {
+            "ready": self.is_ready,
+            "lastCheckedAt": self.last_checked_at,
+            "lastSuccessAt": self.last_success_at,
+            "lastLatencySeconds": None if self.last_latency is None else round(self.last_latency, 4),
+            "lastError": self.last_error,
+        }
+
+    def _run(self) -> None:
+        """Probes until stopped."""
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
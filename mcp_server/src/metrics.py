@@ -0,0 +1,216 @@
+"""This module contains a minimal metrics registry rendering the Prometheus text exposition format."""
+
+import bisect
+import math
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# A sample consists of the metric name suffix, the label values and the value
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """
+    Formats labels as used in the Prometheus text exposition format, e.g. {tool="SFDR_Report"}.
+
+    :param labels: The label names and values.
+
+    :return: The formatted labels, or an empty string if there are none.
+    """
+    if not labels:
+        return ""
+    formatted = (f'{name}="{_escape_label_value(str(value))}"' for name, value in labels.items())
+    return "{" + ",".join(formatted) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    """
+    Escapes backslashes, double quotes and line feeds of a label value.
+
+    :param value: The label value.
+
+    :return: The escaped label value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """
+    Formats a sample value as used in the Prometheus text exposition format.
+
+    :param value: The sample value.
+
+    :return: The formatted value.
+    """
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """A monotonically increasing value per combination of label values."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        Increases the counter of the given label values.
+
+        :param amount: The amount to add.
+        :param labels: The label values.
+        """
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        """Returns one sample per combination of label values."""
+        with self._lock:
+            return [("_total", dict(zip(self.label_names, key)), value) for key, value in self._values.items()]
+
+
+class Histogram:
+    """Counts of observed values in cumulative buckets per combination of label values."""
+
+    type = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            label_names: Sequence[str] = (),
+            buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Records an observed value for the given label values.
+
+        :param value: The observed value, e.g. a duration in seconds.
+        :param labels: The label values.
+        """
+        key = tuple(str(labels[name]) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            bucket_counts, totals = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0, 0.0]))
+            bucket_counts[index] += 1
+            totals[0] += 1
+            totals[1] += value
+
+    def samples(self) -> List[Sample]:
+        """Returns the cumulative bucket counts, the count and the sum per combination of label values."""
+        samples: List[Sample] = []
+        with self._lock:
+            for key, (bucket_counts, (count, total)) in self._values.items():
+                labels = dict(zip(self.label_names, key))
+                cumulative = 0
+                for bound, bucket_count in zip((*self.buckets, math.inf), bucket_counts):
+                    cumulative += bucket_count
+                    samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+                samples.append(("_count", labels, count))
+                samples.append(("_sum", labels, total))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together for the /metrics route.
+    Besides metrics updated by the code, collectors can contribute gauges computed at scrape time.
+    """
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: Dict[str, Callable[[], Iterable[Tuple[str, str, List[Sample]]]]] = {}
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        """Creates and registers a counter."""
+        metric = Counter(name, documentation, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            label_names: Sequence[str] = (),
+            buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        """Creates and registers a histogram."""
+        metric = Histogram(name, documentation, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, name: str, collector: Callable[[], Iterable[Tuple[str, str, List[Sample]]]]) -> None:
+        """
+        Registers a function returning gauges as tuples of name, documentation and samples at scrape time.
+        A collector registered under the same name before is replaced, so that the gauges are not rendered twice.
+
+        :param name: The name of the collector, e.g. "server".
+        :param collector: The function collecting the gauges.
+        """
+        self._collectors[name] = collector
+
+    def unregister_collector(self, name: str, collector: Optional[Callable[..., Any]] = None) -> None:
+        """
+        Removes a collector.
+
+        :param name: The name of the collector.
+        :param collector: The function collecting the gauges. If given, the collector is only removed if it has not
+        been replaced by another function in the meantime.
+        """
+        if collector is None or self._collectors.get(name) == collector:
+            self._collectors.pop(name, None)
+
+    def render(self) -> str:
+        """
+        Renders all metrics in the Prometheus text exposition format.
+
+        :return: The metrics as text.
+        """
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        for collector in list(self._collectors.values()):
+            for name, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} gauge")
+                for suffix, labels, value in samples:
+                    lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+TOOL_CALLS = REGISTRY.counter(
+    "dataland_mcp_tool_calls", "Number of MCP tool calls.", ["tool", "status"])
+TOOL_DURATION = REGISTRY.histogram(
+    "dataland_mcp_tool_duration_seconds", "Duration of MCP tool calls including queueing.", ["tool"])
+TOOL_RESPONSE_BYTES = REGISTRY.histogram(
+    "dataland_mcp_tool_response_bytes", "Size of the serialized MCP tool results.", ["tool"], SIZE_BUCKETS)
+UPSTREAM_REQUESTS = REGISTRY.counter(
+    "dataland_mcp_upstream_requests", "Number of requests against Dataland endpoints.", ["endpoint", "status"])
+UPSTREAM_DURATION = REGISTRY.histogram(
+    "dataland_mcp_upstream_duration_seconds", "Duration of requests against Dataland endpoints.", ["endpoint"])
+UPSTREAM_RETRIES = REGISTRY.counter(
+    "dataland_mcp_upstream_retries", "Number of retried requests against Dataland endpoints.", ["endpoint"])
+UPSTREAM_REJECTED = REGISTRY.counter(
+    "dataland_mcp_upstream_rejected",
+    "Number of requests against Dataland endpoints rejected by a circuit breaker or the rate limit.",
+    ["endpoint", "reason"])
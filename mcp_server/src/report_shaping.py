@@ -0,0 +1,299 @@
+"""This module contains helper functions to reduce report data to the parts relevant for the LLM."""
+
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+TRUNCATION_KEY = "_truncated"
+
+OUTPUT_FORMATS = ("json", "table")
+
+TABLE_COLUMNS = ["company", "reportingPeriod", "dataType", "field", "value", "unit", "quality", "page", "document"]
+
+# Keys of an extended data point of the Dataland frameworks, e.g. {"value": 1.0, "quality": "Reported", ...}
+_DATA_POINT_KEYS = {"value", "quality", "comment", "dataSource", "unit", "currency"}
+
+# Bytes kept free in every truncated container for its truncation marker
+_MARKER_RESERVE = 64
+
+# Sentinel for values which were removed entirely
+_OMITTED = object()
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Converts (nested) pydantic models of the generated Dataland clients to plain JSON compatible values.
+    Field names are converted to the camelCase aliases used by the Dataland API, e.g. "greenhouseGasEmissions".
+
+    :param value: A pydantic model, a list or dictionary containing pydantic models or a plain value.
+
+    :return: The JSON compatible representation of the value.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    return value
+
+
+def json_size(value: Any) -> int:
+    """
+    Computes the size of a JSON compatible value when serialized compactly.
+
+    :param value: The JSON compatible value.
+
+    :return: The number of bytes of the UTF-8 encoded JSON.
+    """
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def prune_empty(value: Any) -> Any:
+    """
+    Recursively removes null values as well as empty strings, lists and objects.
+
+    :param value: The JSON compatible value to prune.
+
+    :return: The pruned value, or None if nothing remains.
+    """
+    if isinstance(value, dict):
+        pruned = {key: prune_empty(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item is not None} or None
+    if isinstance(value, list):
+        pruned = [prune_empty(item) for item in value]
+        return [item for item in pruned if item is not None] or None
+    if value == "":
+        return None
+    return value
+
+
+def project_fields(data: Dict[str, Any], field_paths: List[str]) -> Dict[str, Any]:
+    """
+    Selects the given dot-separated field paths of the framework data, e.g. "environmental.greenhouseGasEmissions".
+
+    :param data: The framework data of a single report as JSON compatible dictionary.
+    :param field_paths: The field paths to keep.
+
+    :return: A dictionary containing only the selected fields with their original nesting.
+    :raises Exception: If none of the given field paths exists in the data.
+    """
+    projection: Dict[str, Any] = {}
+    for field_path in field_paths:
+        keys = [key for key in field_path.strip().split(".") if key]
+        value: Any = data
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            if keys:
+                _insert_path(projection, keys, value)
+
+    if not projection:
+        available = ", ".join(data.keys())
+        raise ValueError(f"None of the fields {field_paths} exist in the report. Available categories are: {available}")
+    return projection
+
+
+def _insert_path(target: Dict[str, Any], keys: List[str], value: Any) -> None:
+    """
+    Inserts a value into a nested dictionary, creating the intermediate dictionaries of the path.
+
+    :param target: The dictionary to insert into.
+    :param keys: The keys of the path to the value.
+    :param value: The value to insert.
+    """
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    target[keys[-1]] = value
+
+
+def shape_report(
+        report_data: Any,
+        field_paths: Optional[List[str]] = None,
+        prune: bool = True,
+        max_bytes: Optional[int] = None) -> Any:
+    """
+    Reduces the report data returned by a framework controller before it is sent to the LLM.
+    The report data is a list of datasets, each consisting of "metaInfo" and the framework "data".
+
+    :param report_data: The report data as returned by the generated Dataland clients.
+    :param field_paths: Dot-separated paths of the framework data fields to keep. All fields are kept if empty.
+    :param prune: Whether null values and empty sub-objects are removed.
+    :param max_bytes: The maximum size of the serialized report data. Not limited if None or not positive.
+
+    :return: The reduced JSON compatible report data.
+    :raises Exception: If none of the given field paths exists in the report.
+    """
+    datasets = to_jsonable(report_data)
+    if field_paths:
+        for dataset in datasets if isinstance(datasets, list) else [datasets]:
+            if isinstance(dataset, dict) and isinstance(dataset.get("data"), dict):
+                dataset["data"] = project_fields(dataset["data"], field_paths)
+    if prune:
+        datasets = prune_empty(datasets) or []
+    return truncate_to_budget(datasets, max_bytes)
+
+
+def truncate_to_budget(value: Any, max_bytes: Optional[int]) -> Any:
+    """
+    Shrinks a JSON compatible value to approximately fit into the given number of bytes.
+    Fields and list items are kept in order until the budget is exhausted. Every container from which content
+    was dropped receives a "_truncated" marker listing the omitted fields or the number of omitted items.
+
+    :param value: The JSON compatible value to shrink.
+    :param max_bytes: The maximum size of the serialized value in bytes. Not limited if None or not positive.
+
+    :return: The value itself if it fits, otherwise its truncated copy.
+    """
+    if not max_bytes or max_bytes <= 0:
+        return value
+    fitted, _ = _fit(value, max_bytes)
+    if fitted is _OMITTED:
+        return {TRUNCATION_KEY: {"reason": f"The data exceeds the response size limit of {max_bytes} bytes"}}
+    return fitted
+
+
+def _fit(value: Any, budget: int) -> Tuple[Any, int]:
+    """
+    Recursive helper of truncate_to_budget.
+
+    :param value: The JSON compatible value to shrink.
+    :param budget: The number of bytes available for the value.
+
+    :return: The (possibly truncated) value or the omission sentinel, and its serialized size.
+    """
+    size = json_size(value)
+    if size <= budget:
+        return value, size
+    if isinstance(value, dict):
+        fitted_dict: Dict[str, Any] = {}
+        omitted_fields: List[str] = []
+        used = 2
+        for key, item in value.items():
+            key_size = json_size(key) + 2
+            fitted, item_size = _fit(item, budget - used - key_size - _MARKER_RESERVE)
+            if fitted is _OMITTED:
+                omitted_fields.append(key)
+                continue
+            fitted_dict[key] = fitted
+            used += key_size + item_size
+        if not fitted_dict:
+            return _OMITTED, 0
+        if omitted_fields:
+            marker_budget = max(budget - used - json_size(TRUNCATION_KEY) - 2, _MARKER_RESERVE)
+            fitted_dict[TRUNCATION_KEY] = _omitted_fields_marker(omitted_fields, marker_budget)
+        return fitted_dict, json_size(fitted_dict)
+    if isinstance(value, list):
+        fitted_list: List[Any] = []
+        used = 2
+        for index, item in enumerate(value):
+            fitted, item_size = _fit(item, budget - used - 1 - _MARKER_RESERVE)
+            if fitted is _OMITTED:
+                fitted_list.append({TRUNCATION_KEY: {"omittedItems": len(value) - index}})
+                break
+            fitted_list.append(fitted)
+            used += item_size + 1
+        if not fitted_list or fitted_list[0] == {TRUNCATION_KEY: {"omittedItems": len(value)}}:
+            return _OMITTED, 0
+        return fitted_list, json_size(fitted_list)
+    return _OMITTED, 0
+
+
+def _omitted_fields_marker(omitted_fields: List[str], budget: int) -> Dict[str, Any]:
+    """
+    Creates the truncation marker of a dict, listing the omitted fields as far as they fit into the budget
+    and counting the remaining ones.
+
+    :param omitted_fields: The keys of the omitted fields.
+    :param budget: The number of bytes available for the marker.
+
+    :return: The marker, e.g. {"omittedFields": ["social"], "furtherOmittedFields": 12}.
+    """
+    listed: List[str] = []
+    used = json_size({"omittedFields": [], "furtherOmittedFields": len(omitted_fields)})
+    for field in omitted_fields:
+        field_size = json_size(field) + 1
+        if used + field_size > budget:
+            break
+        listed.append(field)
+        used += field_size
+    marker: Dict[str, Any] = {"omittedFields": listed}
+    if len(listed) < len(omitted_fields):
+        marker["furtherOmittedFields"] = len(omitted_fields) - len(listed)
+    return marker
+
+
+def flatten_report(
+        report_data: Any,
+        company_name: str,
+        reporting_period: str,
+        data_type: str) -> List[List[Any]]:
+    """
+    Flattens the framework data of a report into table rows with the columns of TABLE_COLUMNS.
+    Every data point becomes one row holding its value, unit, quality and source, so that the keys repeated
+    on every data point of the nested representation are stated only once in the column header.
+    Plain values outside of data points become rows with only a value.
+
+    :param report_data: The JSON compatible report data, i.e. a list of datasets with "metaInfo" and "data".
+    :param company_name: Name of the company the report belongs to, e.g. "BASF SE".
+    :param reporting_period: The fiscal year of the report as a string, e.g. "2024".
+    :param data_type: The reporting framework of the report, e.g. "sfdr".
+
+    :return: The table rows.
+    """
+    rows: List[List[Any]] = []
+    for dataset in report_data if isinstance(report_data, list) else [report_data]:
+        data = dataset.get("data", dataset) if isinstance(dataset, dict) else dataset
+        for field_path, value in _iterate_leaves(data, ""):
+            if isinstance(value, dict):
+                data_source = value.get("dataSource") or {}
+                rows.append([
+                    company_name,
+                    reporting_period,
+                    data_type,
+                    field_path,
+                    value.get("value"),
+                    value.get("unit", value.get("currency")),
+                    value.get("quality"),
+                    data_source.get("page"),
+                    data_source.get("fileName"),
+                ])
+            else:
+                rows.append([company_name, reporting_period, data_type, field_path, value, None, None, None, None])
+    return rows
+
+
+def _iterate_leaves(value: Any, path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Recursively iterates over the data points and plain values of nested framework data.
+
+    :param value: The JSON compatible value.
+    :param path: The dot-separated field path of the value.
+
+    :return: An iterator of field paths and data points or plain values.
+    """
+    if isinstance(value, dict):
+        if value and set(value) <= _DATA_POINT_KEYS and not isinstance(value.get("value", None), (dict, list)):
+            yield path, value
+            return
+        for key, item in value.items():
+            yield from _iterate_leaves(item, f"{path}.{key}" if path else key)
+    elif isinstance(value, list) and any(isinstance(item, (dict, list)) for item in value):
+        for index, item in enumerate(value):
+            yield from _iterate_leaves(item, f"{path}[{index}]")
+    else:
+        yield path, value
+
+
+def rows_to_table(rows: List[List[Any]]) -> Dict[str, Any]:
+    """
+    Wraps table rows into a columnar table representation.
+
+    :param rows: The table rows as returned by flatten_report.
+
+    :return: The table as {"columns": [...], "rows": [[...], ...]}.
+    """
+    return {"columns": TABLE_COLUMNS, "rows": rows}
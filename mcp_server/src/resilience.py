@@ -0,0 +1,383 @@
+"""This module contains the rate limiting, retry and circuit breaker policies protecting the Dataland requests."""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from urllib3.exceptions import HTTPError
+
+from metrics import UPSTREAM_REJECTED, UPSTREAM_RETRIES
+
+# Response statuses indicating a transient failure of Dataland, for which a later retry may succeed
+TRANSIENT_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class UpstreamError(Exception):
+    """
+    A request to Dataland failed or was not sent in order to protect Dataland.
+    The error states whether and when the request may be retried, so that clients do not amplify an outage.
+    """
+
+    def __init__(
+            self,
+            message: str,
+            endpoint: str,
+            status: Optional[int] = None,
+            retryable: bool = False,
+            retry_after: Optional[float] = None):
+        """
+        :param message: A description of the failure.
+        :param endpoint: The name of the Dataland endpoint, e.g. "company_search".
+        :param status: The response status of Dataland, if a response was received.
+        :param retryable: Whether the request may succeed if it is retried later.
+        :param retry_after: The number of seconds after which a retry is expected to be accepted, if known.
+        """
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the error into the structured error returned by the tools.
+
+        :return: The error as {"error": ..., "endpoint": ..., "status": ..., "retryable": ..., "retryAfterSeconds": ...}.
+        """
+        return {
+            "error": str(self),
+            "endpoint": self.endpoint,
+            "status": self.status,
+            "retryable": self.retryable,
+            "retryAfterSeconds": None if self.retry_after is None else round(self.retry_after, 1),
+        }
+
+
+def error_details(exc: Exception) -> Dict[str, Any]:
+    """
+    Describes an exception as structured error, which is detailed for failed Dataland requests.
+
+    :param exc: The exception to describe.
+
+    :return: The structured error, containing at least the error message under the key "error".
+    """
+    if isinstance(exc, UpstreamError):
+        return exc.to_dict()
+    return {"error": str(exc)}
+
+
+def is_transient(exc: Exception) -> bool:
+    """
+    Determines whether a failed request may succeed if it is retried, i.e. whether Dataland responded with a
+    transient error status or the connection failed or timed out.
+
+    :param exc: The exception raised by the generated API client.
+
+    :return: True if the failure is transient, otherwise False.
+    """
+    status = getattr(exc, "status", None)
+    if status is not None:
+        return status in TRANSIENT_STATUSES
+    return isinstance(exc, (HTTPError, OSError))
+
+
+def describe_failure(exc: Exception) -> str:
+    """
+    Describes a failed request briefly, omitting the response headers and body contained in API exceptions.
+
+    :param exc: The exception raised by the generated API client.
+
+    :return: The description, e.g. "503 Service Unavailable".
+    """
+    status = getattr(exc, "status", None)
+    if status is not None:
+        return f"{status} {getattr(exc, 'reason', None) or ''}".strip()
+    return f"{type(exc).__name__}: {exc}"
+
+
+def get_retry_after(exc: Exception) -> Optional[float]:
+    """
+    Reads the number of seconds to wait before a retry from the Retry-After header of a failed response.
+
+    :param exc: The exception raised by the generated API client.
+
+    :return: The number of seconds, or None if the response has no Retry-After header in seconds.
+    """
+    headers = getattr(exc, "headers", None) or {}
+    try:
+        return max(float(headers.get("Retry-After")), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    A thread safe token bucket limiting the rate of requests while allowing short bursts.
+    The bucket is refilled continuously at the given rate up to its capacity, each request takes one token.
+    """
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        """
+        :param rate: The number of tokens added per second.
+        :param capacity: The maximum number of tokens, i.e. the maximum burst of requests.
+        :param clock: The monotonic clock used to refill the bucket.
+        """
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> bool:
+        """
+        Takes a token from the bucket, waiting until one is available.
+
+        :param timeout: The maximum number of seconds to wait for a token.
+
+        :return: True if a token was taken, False if none became available within the timeout.
+        """
+        deadline = self._clock() + timeout
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    A thread safe circuit breaker failing requests fast while an endpoint is degraded.
+    After the given number of consecutive transient failures, the circuit opens and requests are rejected.
+    Once the reset timeout has passed, a single trial request is let through, which closes the circuit if it succeeds
+    and opens it again otherwise. A trial request that has not completed within the reset timeout, e.g. because it
+    was never sent, is replaced by a new trial request.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        """
+        :param failure_threshold: The number of consecutive transient failures opening the circuit, 0 disables it.
+        :param reset_timeout: The number of seconds after which a trial request is let through an open circuit.
+        :param clock: The monotonic clock used to measure the reset timeout.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._clock = clock
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Checks whether a request may be sent, letting through a single trial request once the reset timeout passed.
+
+        :return: True if the request may be sent, otherwise False.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.retry_after() <= 0:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and self.retry_after() <= 0:
+                self._trial_in_flight = True
+                self._trial_started_at = self._clock()
+                return True
+            return False
+
+    def release(self) -> None:
+        """Releases a trial request that was let through but not sent, so that the next request becomes the trial."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def retry_after(self) -> float:
+        """
+        :return: The number of seconds until the next trial request is let through, 0 if the circuit is closed or a
+        trial request may be sent right away.
+        """
+        if self.state == self.CLOSED:
+            return 0.0
+        if self.state == self.HALF_OPEN:
+            if not self._trial_in_flight:
+                return 0.0
+            return max(self._trial_started_at + self.reset_timeout - self._clock(), 0.0)
+        return max(self._opened_at + self.reset_timeout - self._clock(), 0.0)
+
+    def record_success(self) -> None:
+        """Records a request that reached a responsive endpoint, closing the circuit."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Records a transient failure, opening the circuit if the threshold is reached or the trial request failed."""
+        with self._lock:
+            self.failures += 1
+            if self.failure_threshold > 0 and (self.state == self.HALF_OPEN or self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+
+class UpstreamGuard:
+    """
+    Protects Dataland from load spikes and the server from a degraded Dataland.
+    Requests are rate limited per upstream service and pass through a circuit breaker per endpoint.
+    Idempotent requests failing with a transient error are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+            self,
+            rate_limit: float,
+            rate_burst: int,
+            rate_limit_wait: float,
+            max_retries: int,
+            retry_base_delay: float,
+            retry_max_delay: float,
+            failure_threshold: int,
+            reset_timeout: float):
+        """
+        :param rate_limit: The maximum number of requests per second per upstream service, 0 disables the limit.
+        :param rate_burst: The maximum number of requests per upstream service sent in a burst.
+        :param rate_limit_wait: The maximum number of seconds a request waits for the rate limit.
+        :param max_retries: The maximum number of retries of a failed idempotent request.
+        :param retry_base_delay: The maximum delay in seconds before the first retry, doubled for every further retry.
+        :param retry_max_delay: The upper bound of the delay in seconds before a retry.
+        :param failure_threshold: The number of consecutive transient failures opening the circuit of an endpoint.
+        :param reset_timeout: The number of seconds after which an open circuit lets through a trial request.
+        """
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.rate_limit_wait = rate_limit_wait
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def call(self, service: str, endpoint: str, request: Callable[[], Any], idempotent: bool = True) -> Any:
+        """
+        Sends a request to Dataland according to the rate limit, circuit breaker and retry policies.
+
+        :param service: The name of the upstream service, e.g. "backend".
+        :param endpoint: The name of the endpoint, e.g. "company_search".
+        :param request: A function sending the request once and returning its response.
+        :param idempotent: Whether the request may be retried, which is the case for GET requests.
+
+        :return: The response of the request.
+        :raises UpstreamError: If the request was rejected locally or failed with a transient error.
+        :raises Exception: If the request failed with a non-transient error, e.g. because a resource was not found.
+        """
+        breaker = self.get_breaker(endpoint)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                UPSTREAM_REJECTED.inc(endpoint=endpoint, reason="circuit_open")
+                raise UpstreamError(
+                    f"Dataland is currently unavailable for '{endpoint}' requests after repeated failures",
+                    endpoint=endpoint, retryable=True, retry_after=breaker.retry_after())
+            try:
+                self._acquire(service, endpoint)
+            except UpstreamError:
+                breaker.release()
+                raise
+            try:
+                response = request()
+            except Exception as exc:
+                if not is_transient(exc):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                retry_after = get_retry_after(exc)
+                if not idempotent or attempt >= self.max_retries:
+                    raise UpstreamError(
+                        f"The request to Dataland failed after {attempt + 1} attempt(s): {describe_failure(exc)}",
+                        endpoint=endpoint, status=getattr(exc, "status", None), retryable=True,
+                        retry_after=retry_after) from exc
+                attempt += 1
+                UPSTREAM_RETRIES.inc(endpoint=endpoint)
+                time.sleep(self._backoff(attempt, retry_after))
+            else:
+                breaker.record_success()
+                return response
+
+    def _acquire(self, service: str, endpoint: str) -> None:
+        """
+        Waits for the rate limit of the upstream service.
+
+        :param service: The name of the upstream service, e.g. "backend".
+        :param endpoint: The name of the endpoint, reported in the error.
+        :raises UpstreamError: If the rate limit does not admit the request within the configured wait time.
+        """
+        if self.rate_limit <= 0:
+            return
+        with self._lock:
+            bucket = self._buckets.get(service)
+            if bucket is None:
+                bucket = self._buckets[service] = TokenBucket(self.rate_limit, self.rate_burst)
+        if not bucket.acquire(self.rate_limit_wait):
+            UPSTREAM_REJECTED.inc(endpoint=endpoint, reason="rate_limited")
+            raise UpstreamError(
+                "The rate limit of requests to Dataland was exceeded, the request was not sent",
+                endpoint=endpoint, retryable=True, retry_after=self.rate_burst / self.rate_limit)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """
+        Computes the delay before a retry using exponential backoff with full jitter.
+
+        :param attempt: The number of the retry, starting at 1.
+        :param retry_after: The delay requested by Dataland in seconds, if any.
+
+        :return: The delay in seconds.
+        """
+        delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.retry_max_delay))
+        return delay
+
+    def get_breaker(self, endpoint: str) -> CircuitBreaker:
+        """
+        :param endpoint: The name of the endpoint, e.g. "company_search".
+
+        :return: The circuit breaker of the endpoint, which is created on first use.
+        """
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: The state of the circuit breaker of every endpoint used so far, i.e.
+        {endpoint: {"state": ..., "consecutiveFailures": ..., "retryAfterSeconds": ...}}.
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {
+            endpoint: {
+                "state": breaker.state,
+                "consecutiveFailures": breaker.failures,
+                "retryAfterSeconds": round(breaker.retry_after(), 1),
+            }
+            for endpoint, breaker in breakers.items()
+        }
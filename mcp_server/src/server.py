@@ -1,26 +1,50 @@
 """This module contains the Dataland MCP server and its defined tools."""
 
-from typing import Optional, Dict, Union
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional, Dict, List, Tuple, Union
 
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
+from fastmcp.server.dependencies import get_context
+from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse, PlainTextResponse, Response
 
 from dataland_client import DatalandClient
+from executor import ToolExecutor
+from health import UpstreamProbe
+from metrics import REGISTRY, TOOL_CALLS, TOOL_DURATION, TOOL_RESPONSE_BYTES
+from report_shaping import json_size, to_jsonable
+from resilience import UpstreamError
 from server_utils import DatalandMCPUtils
-from dataland_backend.models.sfdr_data import SfdrData
-from dataland_backend.models.eutaxonomy_financials_data import EutaxonomyFinancialsData
-from dataland_backend.models.eutaxonomy_non_financials_data import EutaxonomyNonFinancialsData
-from dataland_backend.models.nuclear_and_gas_data import NuclearAndGasData
-from dataland_backend.models.data_type_enum import DataTypeEnum
+from settings import ServerSettings
+from streaming import ProgressReporter
+from tracing import TRACER
 
 
 class DatalandMCPServer:
 
-    def __init__(self, client: DatalandClient):
+    def __init__(self, client: DatalandClient, settings: Optional[ServerSettings] = None):
         self.client: DatalandClient = client
+        self.settings: ServerSettings = settings or ServerSettings.from_env()
         self.app = FastMCP("DatalandMCP")
-        self.utils: DatalandMCPUtils = DatalandMCPUtils(self.client)
+        # A single utils instance is shared by all tools, so its caches are shared as well
+        self.utils: DatalandMCPUtils = DatalandMCPUtils(self.client, self.settings)
+        self.executor: ToolExecutor = ToolExecutor(
+            max_workers=self.settings.tool_max_workers,
+            timeout=self.settings.tool_timeout,
+        )
+        self.upstream_probe: UpstreamProbe = UpstreamProbe(
+            probe=self.utils.probe_upstream,
+            interval=self.settings.readiness_probe_interval,
+        )
+        TRACER.configure(
+            exporter=self.settings.tracing_exporter,
+            path=self.settings.tracing_file,
+            slow_call_threshold=self.settings.slow_call_threshold,
+        )
+        REGISTRY.register_collector("server", self._collect_cache_metrics)
         self._register_tools()
         self._register_custom_routes()
 
@@ -33,25 +57,157 @@ class DatalandMCPServer:
         :param port: Port of URL. Only used for http, streamable-http transport.
         """
         t = (transport or "").strip().lower()
-        if t in {"http", "streamable-http"}:
-            self.app.run(transport="streamable-http", host=host, port=port)
-        else:
-            # stdio mode: no host/port
-            self.app.run(transport="stdio")
+        try:
+            if t in {"http", "streamable-http"}:
+                self._start_background_tasks(probe_upstream=True)
+                self.app.run(transport="streamable-http", host=host, port=port)
+            else:
+                # stdio mode: no host/port
+                self._start_background_tasks(probe_upstream=False)
+                self.app.run(transport="stdio")
+        finally:
+            self._stop_background_tasks()
+
+    def http_app(self) -> Starlette:
+        """
+        Creates the ASGI application serving the streamable-http transport in a worker process of the multi-worker mode.
+        The transport is stateless, so that any worker can serve any request and no session affinity is required.
+        The background tasks of the server run for the lifetime of the application.
+
+        :return: The ASGI application.
+        """
+        app = self.app.http_app(transport="streamable-http", stateless_http=True)
+        mcp_lifespan = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(starlette_app: Starlette) -> AsyncIterator[None]:
+            self._start_background_tasks(probe_upstream=True)
+            try:
+                async with mcp_lifespan(starlette_app):
+                    yield
+            finally:
+                self._stop_background_tasks()
+
+        app.router.lifespan_context = lifespan
+        return app
+
+    def _start_background_tasks(self, probe_upstream: bool) -> None:
+        """
+        Starts the background threads of the server.
+
+        :param probe_upstream: Whether to probe the Dataland connectivity for the readiness route.
+        """
+        if self.utils.company_index is not None:
+            self.utils.company_index.start()
+        if probe_upstream:
+            self.upstream_probe.start()
+
+    def _stop_background_tasks(self) -> None:
+        """Stops the background threads and releases the tool executor, the caches, the trace file and the metrics."""
+        if self.utils.company_index is not None:
+            self.utils.company_index.stop()
+        self.upstream_probe.stop()
+        self.executor.shutdown()
+        self.utils.close()
+        TRACER.close()
+        REGISTRY.unregister_collector("server", self._collect_cache_metrics)
 
     def _register_tools(self):
         """Register tools for the Dataland MCP Server."""
+        self.app.tool(name="Search_Companies")(self._search_companies)
         self.app.tool(name="Company_Available_Reports")(self._get_company_available_reports)
+        self.app.tool(name="Report_Coverage")(self._get_report_coverage)
         self.app.tool(name="SFDR_Report")(self._get_sfdr_data)
         self.app.tool(name="EU_Taxonomy_Financial_Report")(self._get_eu_fin_taxonomy_data)
         self.app.tool(name="EU_Taxonomy_Non_Financial_Report")(self._get_eu_nf_taxonomy_data)
         self.app.tool(name="EU_Taxonomy_Nuclear_Gas_Report")(self._get_eu_nuclear_gas_taxonomy_data)
+        self.app.tool(name="Batch_Report_Data")(self._get_batch_report_data)
+        self.app.tool(name="Portfolio_Aggregates")(self._get_portfolio_aggregates)
 
     def _register_custom_routes(self):
-        """Register custom routes to perform health checks."""
+        """Register custom routes to perform health and readiness checks and expose metrics."""
         self.app.custom_route("/health", methods=["GET"])(self._health_check)
+        self.app.custom_route("/ready", methods=["GET"])(self._readiness_check)
+        self.app.custom_route("/metrics", methods=["GET"])(self._metrics)
+
+    async def _run_tool(self, tool_name: str, func: Callable[..., Any], **kwargs: Any) -> Any:
+        """
+        Runs a blocking utils function on the tool executor, so that the event loop keeps serving other sessions.
+        The duration, outcome and response size of the call are recorded in the tool metrics.
+        The call is traced as root span of a new trace, labelled with the MCP request id if called by an MCP client.
+
+        :param tool_name: The name of the tool used as metric label.
+        :param func: The utils function performing the Dataland requests.
+        :param kwargs: Keyword arguments passed to the function.
+
+        :return: The result of the function if successful, otherwise an Exception string. Failed Dataland requests are
+        returned as structured error stating whether and when the call may be retried.
+        """
+        start = time.perf_counter()
+        try:
+            with TRACER.span(f"tool {tool_name}", **self._trace_attributes(tool_name)):
+                result, size = await self.executor.run(self._serialize_result, func, **kwargs)
+        except UpstreamError as exc:
+            result = exc.to_dict()
+            size = json_size(result)
+            TOOL_CALLS.inc(tool=tool_name, status="error")
+        except Exception as exc:
+            result = str(exc)
+            size = len(result.encode("utf-8"))
+            TOOL_CALLS.inc(tool=tool_name, status="error")
+        else:
+            TOOL_CALLS.inc(tool=tool_name, status="success")
+        TOOL_DURATION.observe(time.perf_counter() - start, tool=tool_name)
+        TOOL_RESPONSE_BYTES.observe(size, tool=tool_name)
+        return result
+
+    @staticmethod
+    def _trace_attributes(tool_name: str) -> Dict[str, Any]:
+        """
+        :param tool_name: The name of the called tool.
+
+        :return: The attributes of the tool call span, i.e. the tool name and the MCP request id if available.
+        """
+        attributes = {"mcp.tool.name": tool_name}
+        if TRACER.enabled:
+            try:
+                attributes["mcp.request.id"] = get_context().request_id
+            except (RuntimeError, ValueError):
+                pass
+        return attributes
+
+    def _serialize_result(self, func: Callable[..., Any], **kwargs: Any) -> Tuple[Any, int]:
+        """
+        Calls the utils function and converts its result into JSON compatible data on the executor thread.
+
+        :param func: The utils function performing the Dataland requests.
+        :param kwargs: Keyword arguments passed to the function.
+
+        :return: The result and its serialized size in bytes.
+        """
+        result = func(**kwargs)
+        with TRACER.span("serialize") as span:
+            result = to_jsonable(result)
+            size = json_size(result)
+            if span is not None:
+                span.set_attribute("mcp.response.bytes", size)
+            return result, size
+
+    async def _search_companies(self, query: str, limit: int = 5):
+        """
+        Searches Dataland for the companies best matching a company name or LEI and returns ranked candidates.
+        Use this tool if a company name is ambiguous, misspelled or incomplete, or if a report tool did not find the
+        company, and pass the exact name of the intended candidate to the other tools.
+
+        :param query: The company name, a part or misspelling of it, or an LEI, e.g. "Allianz" or "Deutsche Bank".
+        :param limit: The maximum number of candidates to return, 5 by default.
+
+        :return: The candidates ordered by relevance with their company name, identifier, LEI, country, sector and
+        headquarters if found, otherwise an Exception string.
+        """
+        return await self._run_tool("Search_Companies", self.utils.search_companies, query=query, limit=limit)
 
-    def _get_company_available_reports(self, company_name: str):
+    async def _get_company_available_reports(self, company_name: str):
         """
         Retrieves a list of the available reports and its metadata for a given company from Dataland.
         It contains the active and accepted reports of all available frameworks and reporting periods.
@@ -61,14 +217,44 @@ class DatalandMCPServer:
         :return: Returns a list of data types and reporting periods of the available reports if the company is found,
         otherwise an Exception string.
         """
-        try:
-            available_reports = self.utils.get_available_company_reports(company_name=company_name)
-        except Exception as exc:
-            return str(exc)
-        else:
-            return available_reports
+        return await self._run_tool(
+            "Company_Available_Reports", self.utils.get_available_company_reports, company_name=company_name)
 
-    def _get_sfdr_data(self, company_name: str, reporting_period: str):# -> Union[str, Dict[str, SfdrData]]:
+    async def _get_report_coverage(
+            self,
+            company_names: Optional[List[str]] = None,
+            portfolio_id: Optional[str] = None,
+            data_types: Optional[List[str]] = None,
+            reporting_periods: Optional[List[str]] = None):
+        """
+        Checks in one call which of many companies have reports available in Dataland, e.g. to answer
+        "which of these companies have SFDR data for 2024?". Use this tool instead of repeated
+        Company_Available_Reports calls when checking several companies or a whole portfolio.
+
+        :param company_names: Names of the companies to check, e.g. ["BASF SE", "Allianz SE"].
+        :param portfolio_id: Optional identifier of a Dataland portfolio of the user whose companies are checked.
+        :param data_types: Optional reporting frameworks to check, any of "sfdr", "eutaxonomy-financials",
+        "eutaxonomy-non-financials" and "nuclear-and-gas". All frameworks if omitted.
+        :param reporting_periods: Optional fiscal years to check as strings, e.g. ["2024"]. All years if omitted.
+
+        :return: The number and share of companies with reports per framework and reporting period, and the available
+        reports per company if found, otherwise an Exception string.
+        """
+        return await self._run_tool(
+            "Report_Coverage",
+            self.utils.get_report_coverage,
+            company_names=company_names,
+            portfolio_id=portfolio_id,
+            data_types=data_types,
+            reporting_periods=reporting_periods
+        )
+
+    async def _get_sfdr_data(
+            self,
+            company_name: str,
+            reporting_period: str,
+            fields: Optional[List[str]] = None,
+            output_format: str = "json"):
         """
         Retrieves the SFDR data for a given company name and reporting period from Dataland.
         This data refers to the environmental, social, and governance (ESG) metrics and
@@ -76,21 +262,29 @@ class DatalandMCPServer:
 
         :param company_name: Name of the company for which the SFDR report is retrieved, e.g. "BASF SE".
         :param reporting_period: The fiscal year of the SFDR report as a string, e.g. "2024".
+        :param fields: Optional dot-separated paths of the report fields to return,
+        e.g. ["environmental.greenhouseGasEmissions"]. Returns all fields if omitted.
+        :param output_format: "json" (default) for the nested report data or "table" for a compact table with one row
+        per data point and the columns field, value, unit, quality, page and document.
 
         :return: The SFDR data for the given company name and reporting period if found, otherwise an Exception string.
         """
-        try:
-            sfdr_data = self.utils.get_report_data(
-                company_name=company_name,
-                reporting_period=reporting_period,
-                data_type=DataTypeEnum.SFDR
-            )
-        except Exception as exc:
-            return str(exc)
-        else:
-            return sfdr_data
+        return await self._run_tool(
+            "SFDR_Report",
+            self.utils.get_report_data,
+            company_name=company_name,
+            reporting_period=reporting_period,
+            data_type="sfdr",
+            fields=fields,
+            output_format=output_format
+        )
 
-    def _get_eu_fin_taxonomy_data(self, company_name: str, reporting_period: str):# -> Union[str, Dict[str, EutaxonomyFinancialsData]]:
+    async def _get_eu_fin_taxonomy_data(
+            self,
+            company_name: str,
+            reporting_period: str,
+            fields: Optional[List[str]] = None,
+            output_format: str = "json"):
         """
         Retrieves the EU Taxonomy data of financial companies for a given company name and
         reporting period from Dataland. It encompasses disclosures on how financial products manage
@@ -98,22 +292,30 @@ class DatalandMCPServer:
 
         :param company_name: Name of the financial company for which the Taxonomy report is retrieved, e.g. "Allianz SE".
         :param reporting_period: The fiscal year of the Taxonomy report as a string, e.g. "2024".
+        :param fields: Optional dot-separated paths of the report fields to return,
+        e.g. ["general", "revenue"]. Returns all fields if omitted.
+        :param output_format: "json" (default) for the nested report data or "table" for a compact table with one row
+        per data point and the columns field, value, unit, quality, page and document.
 
         :return: The financial Taxonomy data for the given company name and reporting period if found,
         otherwise an Exception string.
         """
-        try:
-            tax_fin_data = self.utils.get_report_data(
-                company_name=company_name,
-                reporting_period=reporting_period,
-                data_type=DataTypeEnum.EUTAXONOMY_MINUS_FINANCIALS
-            )
-        except Exception as exc:
-            return str(exc)
-        else:
-            return tax_fin_data
+        return await self._run_tool(
+            "EU_Taxonomy_Financial_Report",
+            self.utils.get_report_data,
+            company_name=company_name,
+            reporting_period=reporting_period,
+            data_type="eutaxonomy-financials",
+            fields=fields,
+            output_format=output_format
+        )
 
-    def _get_eu_nf_taxonomy_data(self, company_name: str, reporting_period: str):# -> Union[str, Dict[str, EutaxonomyNonFinancialsData]]:
+    async def _get_eu_nf_taxonomy_data(
+            self,
+            company_name: str,
+            reporting_period: str,
+            fields: Optional[List[str]] = None,
+            output_format: str = "json"):
         """
         Retrieves the EU Taxonomy data of non-financial companies for a given company name and
         reporting period from Dataland. It encompasses disclosures on how financial products manage
@@ -121,22 +323,30 @@ class DatalandMCPServer:
 
         :param company_name: Name of the non-financial company for which the Taxonomy report is retrieved, e.g. "BASF SE".
         :param reporting_period: The fiscal year of the Taxonomy report as a string, e.g. "2024".
+        :param fields: Optional dot-separated paths of the report fields to return,
+        e.g. ["general", "revenue"]. Returns all fields if omitted.
+        :param output_format: "json" (default) for the nested report data or "table" for a compact table with one row
+        per data point and the columns field, value, unit, quality, page and document.
 
         :return: The non-financial Taxonomy data for the given company name and reporting period if found,
         otherwise an Exception string.
         """
-        try:
-            tax_nf_data = self.utils.get_report_data(
-                company_name=company_name,
-                reporting_period=reporting_period,
-                data_type=DataTypeEnum.EUTAXONOMY_MINUS_NON_MINUS_FINANCIALS
-            )
-        except Exception as exc:
-            return str(exc)
-        else:
-            return tax_nf_data
+        return await self._run_tool(
+            "EU_Taxonomy_Non_Financial_Report",
+            self.utils.get_report_data,
+            company_name=company_name,
+            reporting_period=reporting_period,
+            data_type="eutaxonomy-non-financials",
+            fields=fields,
+            output_format=output_format
+        )
 
-    def _get_eu_nuclear_gas_taxonomy_data(self, company_name: str, reporting_period: str):# -> Union[str, Dict[str, NuclearAndGasData]]:
+    async def _get_eu_nuclear_gas_taxonomy_data(
+            self,
+            company_name: str,
+            reporting_period: str,
+            fields: Optional[List[str]] = None,
+            output_format: str = "json"):
         """
         Retrieves the EU Nuclear and Gas Taxonomy data for a given company name and reporting period from Dataland.
         It outlines the inclusion of nuclear energy and natural gas as transitional activities,
@@ -144,22 +354,150 @@ class DatalandMCPServer:
 
         :param company_name: Name of the company for which the nuclear and gas Taxonomy report is retrieved, e.g. "BASF SE".
         :param reporting_period: The fiscal year of the Taxonomy report as a string, e.g. "2024".
+        :param fields: Optional dot-separated paths of the report fields to return,
+        e.g. ["general", "revenue"]. Returns all fields if omitted.
+        :param output_format: "json" (default) for the nested report data or "table" for a compact table with one row
+        per data point and the columns field, value, unit, quality, page and document.
 
         :return: The nuclear and gas Taxonomy data for the given company name and reporting period if found,
         otherwise an Exception string.
         """
-        try:
-            tax_nuclear_gas_data = self.utils.get_report_data(
-                company_name=company_name,
-                reporting_period=reporting_period,
-                data_type=DataTypeEnum.NUCLEAR_MINUS_AND_MINUS_GAS
-            )
-        except Exception as exc:
-            return str(exc)
-        else:
-            return tax_nuclear_gas_data
+        return await self._run_tool(
+            "EU_Taxonomy_Nuclear_Gas_Report",
+            self.utils.get_report_data,
+            company_name=company_name,
+            reporting_period=reporting_period,
+            data_type="nuclear-and-gas",
+            fields=fields,
+            output_format=output_format
+        )
+
+    async def _get_batch_report_data(
+            self,
+            company_names: List[str],
+            reporting_periods: List[str],
+            data_types: List[str],
+            fields: Optional[List[str]] = None,
+            output_format: str = "json",
+            ctx: Optional[Context] = None):
+        """
+        Retrieves the report data for multiple companies, reporting periods and frameworks from Dataland in one call.
+        Every combination of the given company names, reporting periods and data types is fetched.
+        Use this tool instead of repeated single report calls when comparing several companies or years.
+
+        :param company_names: Names of the companies for which the reports are retrieved, e.g. ["BASF SE", "Allianz SE"].
+        :param reporting_periods: The fiscal years of the reports as strings, e.g. ["2023", "2024"].
+        :param data_types: The reporting frameworks, any of "sfdr", "eutaxonomy-financials",
+        "eutaxonomy-non-financials" and "nuclear-and-gas".
+        :param fields: Optional dot-separated paths of the report fields to return for every report,
+        e.g. ["environmental.greenhouseGasEmissions"]. Returns all fields if omitted.
+        :param output_format: "json" (default) for one entry per report or "table" for a single compact table stacking
+        all reports with one row per data point. Prefer "table" when comparing companies or reporting periods.
+        :param ctx: The MCP context of the call, used to report the progress per completed report.
+
+        :return: A list with one entry per company, reporting period and data type containing either the report data
+        and source URL or an error message, otherwise an Exception string.
+        """
+        return await self._run_tool(
+            "Batch_Report_Data",
+            self.utils.get_batch_report_data,
+            company_names=company_names,
+            reporting_periods=reporting_periods,
+            data_types=data_types,
+            fields=fields,
+            output_format=output_format,
+            on_progress=ProgressReporter(ctx, asyncio.get_running_loop())
+        )
+
+    async def _get_portfolio_aggregates(
+            self,
+            data_type: str,
+            reporting_period: str,
+            fields: List[str],
+            portfolio_id: Optional[str] = None,
+            company_names: Optional[List[str]] = None):
+        """
+        Computes statistics of numeric report fields over all companies of a Dataland portfolio or a list of companies,
+        e.g. the total and median scope 1 emissions of a portfolio. Use this tool instead of retrieving the reports of
+        many companies when only aggregated figures are needed.
+
+        :param data_type: The reporting framework, one of "sfdr", "eutaxonomy-financials", "eutaxonomy-non-financials"
+        and "nuclear-and-gas".
+        :param reporting_period: The fiscal year of the reports as a string, e.g. "2024".
+        :param fields: Dot-separated paths of the numeric report fields to aggregate,
+        e.g. ["environmental.greenhouseGasEmissions.scope1GhgEmissionsInTonnes"].
+        :param portfolio_id: Optional identifier of a Dataland portfolio of the user whose companies are aggregated.
+        :param company_names: Optional names of the companies to aggregate, e.g. ["BASF SE", "Allianz SE"].
+
+        :return: The report coverage and per field the number of companies reporting a value, the units and the sum,
+        mean, median, minimum, maximum and 10th, 25th, 75th and 90th percentiles of the values if successful,
+        otherwise an Exception string. If the values of a field are reported in different units or currencies, the
+        statistics are only given per unit in "byUnit".
+        """
+        return await self._run_tool(
+            "Portfolio_Aggregates",
+            self.utils.get_portfolio_aggregates,
+            data_type=data_type,
+            reporting_period=reporting_period,
+            fields=fields,
+            portfolio_id=portfolio_id,
+            company_names=company_names
+        )
+
+    def _collect_cache_metrics(self):
+        """Collects the statistics of the caches and the request coalescing as gauges for the /metrics route."""
+        cache_stats = [
+            self.utils.company_cache.get_stats(),
+            self.utils.report_cache.get_stats(),
+            self.utils.metadata_cache.get_stats(),
+        ]
+        for stat, documentation in [
+            ("hits", "Number of cache lookups answered from the cache."),
+            ("misses", "Number of cache lookups not answered from the cache."),
+            ("evictions", "Number of entries evicted because the cache was full."),
+            ("entries", "Number of entries in the cache."),
+            ("bytes", "Total size of the cached values in bytes."),
+            ("hitRatio", "Share of cache lookups answered from the cache."),
+        ]:
+            name = "dataland_mcp_cache_" + "".join("_" + c.lower() if c.isupper() else c for c in stat)
+            yield name, documentation, [("", {"cache": stats["name"]}, stats[stat]) for stats in cache_stats]
+        yield (
+            "dataland_mcp_shared_upstream_calls",
+            "Number of Dataland requests avoided by sharing a concurrent identical request.",
+            [("", {}, self.utils.in_flight.get_stats()["sharedCalls"])],
+        )
+        yield (
+            "dataland_mcp_circuit_breaker_open",
+            "Whether the circuit breaker of a Dataland endpoint currently rejects requests.",
+            [("", {"endpoint": endpoint}, int(stats["state"] != "closed"))
+             for endpoint, stats in self.utils.upstream_guard.get_stats().items()],
+        )
 
     @staticmethod
     async def _health_check(request: Request) -> Response:
         """This custom route is used to perform health checks on the server."""
         return JSONResponse({"status": "healthy", "service": "DatalandMCP"})
+
+    async def _readiness_check(self, request: Request) -> Response:
+        """
+        This custom route reports whether the server can serve tool calls, i.e. whether the most recent background
+        probe reached Dataland. It also reports the load of the server. No request to Dataland is performed.
+        """
+        upstream = self.upstream_probe.get_status()
+        status = {
+            "status": "ready" if upstream["ready"] else "not ready",
+            "service": "DatalandMCP",
+            "upstream": upstream,
+            "toolCallsInFlight": self.executor.active_calls,
+            "maxConcurrentToolCalls": self.executor.max_workers,
+            "upstreamRequestsInFlight": self.utils.upstream_requests_in_flight,
+            "connectionPools": self.client.get_pool_stats(),
+            "circuitBreakers": self.utils.upstream_guard.get_stats(),
+            "companyIndex": None if self.utils.company_index is None else self.utils.company_index.get_stats(),
+        }
+        return JSONResponse(status, status_code=200 if upstream["ready"] else 503)
+
+    @staticmethod
+    async def _metrics(request: Request) -> Response:
+        """This custom route exposes the metrics of the server in the Prometheus text format."""
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
@@ -1,28 +1,270 @@
 """This is a helper module containing helper functions for the server."""
 
-from typing import Union, Dict, List, Callable
+from __future__ import annotations
 
-from pydantic import BaseModel
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Union, Dict, List, Callable, Optional, Set, Tuple
 
+from aggregation import extract_data_point, summarize
+from caching import CacheStore, SingleFlight, TTLCache, open_cache_store
+from company_index import CompanyIndex
 from dataland_client import DatalandClient
-from dataland_backend.models.sfdr_data import SfdrData
-from dataland_backend.models.eutaxonomy_financials_data import EutaxonomyFinancialsData
-from dataland_backend.models.eutaxonomy_non_financials_data import EutaxonomyNonFinancialsData
-from dataland_backend.models.nuclear_and_gas_data import NuclearAndGasData
-from dataland_backend.models.data_type_enum import DataTypeEnum
-from dataland_backend.models.qa_status import QaStatus
+from metrics import UPSTREAM_DURATION, UPSTREAM_REQUESTS
+from report_shaping import (
+    OUTPUT_FORMATS,
+    flatten_report,
+    json_size,
+    rows_to_table,
+    shape_report,
+    to_jsonable,
+    truncate_to_budget,
+)
+from resilience import UpstreamError, UpstreamGuard, error_details
+from settings import ServerSettings
+from tracing import TRACER, in_current_context
+
+if TYPE_CHECKING:
+    # The generated Dataland clients are imported on first use to keep the startup of the server fast
+    from dataland_backend.models.data_type_enum import DataTypeEnum
 
 
 class DatalandMCPUtils:
 
-    def __init__(self, client: DatalandClient):
+    def __init__(self, client: DatalandClient, settings: Optional[ServerSettings] = None):
         self.client: DatalandClient = client
-        self.report_dispatch: Dict[DataTypeEnum, Callable[..., BaseModel]] = {
-            DataTypeEnum.SFDR: self.client.sfdr_api.get_all_company_sfdr_data,
-            DataTypeEnum.EUTAXONOMY_MINUS_FINANCIALS: self.client.eu_taxonomy_fin_api.get_all_company_eutaxonomy_financials_data,
-            DataTypeEnum.EUTAXONOMY_MINUS_NON_MINUS_FINANCIALS: self.client.eu_taxonomy_nf_api.get_all_company_eutaxonomy_non_financials_data,
-            DataTypeEnum.NUCLEAR_MINUS_AND_MINUS_GAS: self.client.eu_taxonomy_nuclear_gas_api.get_all_company_nuclear_and_gas_data,
-        }
+        self.settings: ServerSettings = settings or ServerSettings.from_env()
+        self.cache_store: Optional[CacheStore] = open_cache_store(
+            url=self.settings.cache_url,
+            path=os.path.join(self.settings.cache_path, "dataland_mcp_cache.sqlite3") if self.settings.cache_path else "",
+            max_bytes=self.settings.cache_store_max_bytes,
+        )
+        self.company_cache: TTLCache = TTLCache(
+            name="company",
+            max_entries=self.settings.company_cache_size,
+            ttl=self.settings.company_cache_ttl,
+            store=self.cache_store,
+        )
+        self.report_cache: TTLCache = TTLCache(
+            name="report",
+            max_entries=self.settings.report_cache_max_entries,
+            ttl=self.settings.report_cache_ttl,
+            max_bytes=self.settings.report_cache_max_bytes,
+            sizeof=lambda entry: json_size(entry["reportData"]),
+            store=self.cache_store,
+        )
+        self.metadata_cache: TTLCache = TTLCache(
+            name="metadata",
+            max_entries=self.settings.metadata_cache_max_entries,
+            ttl=self.settings.metadata_cache_ttl,
+            store=self.cache_store,
+        )
+        # Concurrent identical Dataland requests of different sessions share a single call
+        self.in_flight: SingleFlight = SingleFlight()
+        self.upstream_requests_in_flight = 0
+        self._upstream_lock = threading.Lock()
+        # The concurrent Dataland requests are bounded by the size of the connection pools, so that no connection
+        # beyond the pool size is opened and discarded again
+        self._upstream_slots = threading.BoundedSemaphore(self.client.connection_settings.pool_maxsize)
+        # The parallel Dataland requests of all batch, coverage and aggregation tool calls share a single bounded pool
+        self.fanout_pool: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.settings.batch_max_workers, thread_name_prefix="dataland-fanout")
+        self.upstream_guard: UpstreamGuard = UpstreamGuard(
+            rate_limit=self.settings.upstream_rate_limit,
+            rate_burst=self.settings.upstream_rate_burst,
+            rate_limit_wait=self.settings.upstream_rate_limit_wait,
+            max_retries=self.settings.upstream_max_retries,
+            retry_base_delay=self.settings.upstream_retry_base_delay,
+            retry_max_delay=self.settings.upstream_retry_max_delay,
+            failure_threshold=self.settings.circuit_breaker_failure_threshold,
+            reset_timeout=self.settings.circuit_breaker_reset_timeout,
+        )
+        self.company_index: Optional[CompanyIndex] = None
+        if self.settings.company_index_enabled:
+            self.company_index = CompanyIndex(
+                loader=self._load_company_chunk,
+                chunk_size=self.settings.company_index_chunk_size,
+                refresh_interval=self.settings.company_index_refresh_interval,
+            )
+        if self.settings.cache_warm_load:
+            self.company_cache.warm_load()
+            self.report_cache.warm_load()
+            self.metadata_cache.warm_load()
+        self._report_dispatch: Optional[Dict[DataTypeEnum, Callable[..., Any]]] = None
+
+    @property
+    def report_dispatch(self) -> Dict[DataTypeEnum, Callable[..., Any]]:
+        """
+        Maps the supported data types to the GET-Endpoints of their framework controllers.
+        The mapping is created on first use, as it requires importing the generated Dataland backend client.
+        """
+        if self._report_dispatch is None:
+            from dataland_backend.models.data_type_enum import DataTypeEnum
+
+            self._report_dispatch = {
+                DataTypeEnum.SFDR: self.client.sfdr_api.get_all_company_sfdr_data,
+                DataTypeEnum.EUTAXONOMY_MINUS_FINANCIALS: self.client.eu_taxonomy_fin_api.get_all_company_eutaxonomy_financials_data,
+                DataTypeEnum.EUTAXONOMY_MINUS_NON_MINUS_FINANCIALS: self.client.eu_taxonomy_nf_api.get_all_company_eutaxonomy_non_financials_data,
+                DataTypeEnum.NUCLEAR_MINUS_AND_MINUS_GAS: self.client.eu_taxonomy_nuclear_gas_api.get_all_company_nuclear_and_gas_data,
+            }
+        return self._report_dispatch
+
+    def close(self) -> None:
+        """Stops the shared fan-out pool and releases the persistent cache store, if one is configured."""
+        self.fanout_pool.shutdown(wait=False, cancel_futures=True)
+        if self.cache_store is not None:
+            self.cache_store.close()
+
+    def _call_upstream(self, endpoint: str, func: Callable[..., Any], service: str = "backend", **kwargs: Any) -> Any:
+        """
+        Calls a GET endpoint of a Dataland service through the rate limit, retry and circuit breaker policies.
+
+        :param endpoint: The name of the endpoint used as metric label, e.g. "company_search".
+        :param func: The method of the generated API client calling the endpoint.
+        :param service: The name of the Dataland service providing the endpoint, e.g. "users".
+        :param kwargs: Keyword arguments passed to the method.
+
+        :return: The response of the endpoint.
+        :raises UpstreamError: If the request was rejected locally or failed with a transient error.
+        :raises Exception: If the request failed with a non-transient error.
+        """
+        with TRACER.span(f"dataland {endpoint}", **{"dataland.service": service, "dataland.endpoint": endpoint}):
+            return self.upstream_guard.call(
+                service, endpoint, lambda: self._send_upstream_request(endpoint, func, **kwargs))
+
+    def _send_upstream_request(self, endpoint: str, func: Callable[..., Any], **kwargs: Any) -> Any:
+        """
+        Sends a single request to a Dataland API endpoint and records its duration and response status in the
+        upstream metrics.
+
+        :param endpoint: The name of the endpoint used as metric label, e.g. "company_search".
+        :param func: The method of the generated API client calling the endpoint.
+        :param kwargs: Keyword arguments passed to the method.
+
+        :return: The response of the endpoint.
+        :raises Exception: If the request failed.
+        """
+        with self._upstream_slots:
+            start = time.perf_counter()
+            status = "200"
+            with self._upstream_lock:
+                self.upstream_requests_in_flight += 1
+            try:
+                return func(**kwargs)
+            except Exception as exc:
+                status = str(getattr(exc, "status", None) or type(exc).__name__)
+                raise
+            finally:
+                with self._upstream_lock:
+                    self.upstream_requests_in_flight -= 1
+                UPSTREAM_DURATION.observe(time.perf_counter() - start, endpoint=endpoint)
+                UPSTREAM_REQUESTS.inc(endpoint=endpoint, status=status)
+
+    def probe_upstream(self) -> None:
+        """
+        Performs a cheap company search against Dataland to verify the connectivity and the API key.
+        The result bypasses the caches, so that the request always reaches Dataland.
+
+        :raises Exception: If no API key is configured or the request failed.
+        """
+        if not self.client.api_key:
+            raise ValueError("No Dataland API key is configured")
+        self._call_upstream(
+            "probe", self.client.company_api.get_companies, search_string=self.settings.readiness_probe_company)
+
+    @staticmethod
+    def normalize_company_name(company_name: str) -> str:
+        """
+        Normalizes a company name so that spelling variants in case and whitespace share one cache entry.
+
+        :param company_name: The name of the company as a string, e.g. " BASF  SE".
+
+        :return: The normalized company name, e.g. "basf se".
+        """
+        return " ".join(company_name.casefold().split())
+
+    @TRACER.traced("resolve_company")
+    def resolve_company(self, company_name: str) -> Dict[str, Any]:
+        """
+        Resolves a company name to the best matching company of the Dataland search.
+        Resolutions are cached, so repeated lookups of the same company do not hit the Dataland search again.
+        If the local company index is enabled and completely loaded, names matching a single indexed company are resolved
+        without a Dataland request, ambiguous names are still resolved by the Dataland search.
+
+        :param company_name: The name of the company as a string, e.g. "BASF SE"
+
+        :return: The company identifier and the full search hit, i.e. {"companyId": ..., "searchHit": {...}}.
+        :raises Exception: If no company was found or an unexpected error occurred.
+        """
+        cache_key = self.normalize_company_name(company_name)
+        resolution = self.company_cache.get(cache_key)
+        if resolution is not None:
+            return resolution
+        # During the initial load, a name could match a similar company while the exact company is not loaded yet
+        if self.company_index is not None and self.company_index.is_ready:
+            company = self.company_index.lookup(company_name, self.settings.company_index_match_threshold)
+            if company is not None:
+                resolution = {"companyId": company["companyId"], "searchHit": company}
+                self.company_cache.set(cache_key, resolution)
+                return resolution
+        return self.in_flight.do(f"company|{cache_key}", lambda: self._search_company(company_name, cache_key))
+
+    def _search_company(self, company_name: str, cache_key: str) -> Dict[str, Any]:
+        """
+        Searches the company in Dataland and caches the best match.
+
+        :param company_name: The name of the company as a string, e.g. "BASF SE"
+        :param cache_key: The normalized company name under which the resolution is cached.
+
+        :return: The company identifier and the full search hit, i.e. {"companyId": ..., "searchHit": {...}}.
+        :raises Exception: If no company was found or an unexpected error occurred.
+        """
+        company_data = self._call_upstream(
+            "company_search", self.client.company_api.get_companies, search_string=company_name)
+
+        if not company_data:
+            raise ValueError(f"No company found with name '{company_name}' in Dataland")
+
+        resolution = {"companyId": company_data[0].company_id, "searchHit": company_data[0].to_dict()}
+        self.company_cache.set(cache_key, resolution)
+        return resolution
+
+    def search_companies(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Searches the companies best matching a company name or identifier, so that ambiguous or misspelled names can
+        be resolved. The local company index is used once it is loaded, otherwise the Dataland search.
+
+        :param query: The company name, a part or misspelling of it, or an LEI, e.g. "Allainz".
+        :param limit: The maximum number of returned candidates.
+
+        :return: The candidates ordered by relevance, each containing the company identifier, name, LEI, country,
+        sector and headquarters and the match score between 0 and 1 if the local index was used.
+        :raises Exception: If no company was found or an unexpected error occurred.
+        """
+        if self.company_index is not None and self.company_index.is_ready:
+            candidates = self.company_index.search(query, limit=limit)
+        else:
+            company_data = self._call_upstream(
+                "company_search", self.client.company_api.get_companies, search_string=query, chunk_size=limit)
+            candidates = [company.to_dict() for company in company_data[:limit]]
+        if not candidates:
+            raise ValueError(f"No company found matching '{query}' in Dataland")
+        return candidates
+
+    def _load_company_chunk(self, chunk_index: int, chunk_size: int) -> List[Dict[str, Any]]:
+        """
+        Loads a chunk of all Dataland companies for the local company index.
+
+        :param chunk_index: The index of the chunk, starting at 0.
+        :param chunk_size: The number of companies per chunk.
+
+        :return: The companies of the chunk as dictionaries.
+        """
+        company_data = self._call_upstream(
+            "company_snapshot", self.client.company_api.get_companies, chunk_size=chunk_size, chunk_index=chunk_index)
+        return [company.to_dict() for company in company_data]
 
     def get_company_id(self, company_name: str) -> str:
         """
@@ -33,12 +275,15 @@ class DatalandMCPUtils:
         :return: The unique company identifier used in Dataland.
         :raises Exception: If no company was found or an unexpected error occurred.
         """
-        company_data = self.client.company_api.get_companies(search_string=company_name)
+        return self.resolve_company(company_name=company_name)["companyId"]
 
-        if not company_data:
-            raise ValueError(f"No company found with name '{company_name}' in Dataland")
+    def invalidate_company_cache(self, company_name: Optional[str] = None) -> None:
+        """
+        Drops the cached resolution of a single company or, if no name is given, of all companies.
 
-        return company_data[0].company_id
+        :param company_name: The name of the company whose resolution should be dropped, e.g. "BASF SE".
+        """
+        self.company_cache.invalidate(None if company_name is None else self.normalize_company_name(company_name))
 
     def get_available_company_reports(
             self,
@@ -52,40 +297,533 @@ class DatalandMCPUtils:
         :raises Exception: If no meta_data was found or an unexpected error occurred.
         """
         company_id = self.get_company_id(company_name=company_name)
-        meta_data = self.client.meta_api.get_list_of_data_meta_info(
-            company_id=company_id,
-            show_only_active=True,
-            qa_status=QaStatus.ACCEPTED)
+        metadata = self.get_company_metadata(company_id)
 
-        if not meta_data:
+        if not metadata:
             raise ValueError(f"No meta information was found for the company {company_name} in Dataland!")
         else:
             available_reports = []
-            for report in meta_data:
-                available_reports.append({
-                    "dataType": report.data_type,
-                    "reportingPeriod": report.reporting_period,
-                })
+            for data_type, reporting_periods in metadata.items():
+                for reporting_period in reporting_periods:
+                    available_reports.append({
+                        "dataType": data_type,
+                        "reportingPeriod": reporting_period,
+                    })
             return available_reports
 
+    @TRACER.traced("get_company_metadata")
+    def get_company_metadata(self, company_id: str) -> Dict[str, Dict[str, int]]:
+        """
+        Looks up the active and accepted reports of a company in the metadata index.
+        Companies which are not indexed or whose entry is older than the metadata TTL are fetched from Dataland.
+
+        :param company_id: The unique identifier of a company used in Dataland.
+
+        :return: The upload times in milliseconds since epoch per data type and reporting period, e.g.
+        {"sfdr": {"2023": 1700000000000, "2024": 1730000000000}}.
+        """
+        metadata = self.metadata_cache.get(company_id)
+        if metadata is not None:
+            return metadata
+        return self.in_flight.do(f"meta|{company_id}", lambda: self._fetch_company_metadata(company_id))
+
+    def _fetch_company_metadata(self, company_id: str) -> Dict[str, Dict[str, int]]:
+        """
+        Fetches the active and accepted reports of a company from the Dataland metadata and indexes them.
+
+        :param company_id: The unique identifier of a company used in Dataland.
+
+        :return: The upload times in milliseconds since epoch per data type and reporting period.
+        """
+        from dataland_backend.models.qa_status import QaStatus
+
+        meta_data = self._call_upstream(
+            "meta_info",
+            self.client.meta_api.get_list_of_data_meta_info,
+            company_id=company_id,
+            show_only_active=True,
+            qa_status=QaStatus.ACCEPTED)
+
+        metadata: Dict[str, Dict[str, int]] = {}
+        for report in meta_data:
+            data_type = getattr(report.data_type, "value", report.data_type)
+            periods = metadata.setdefault(data_type, {})
+            periods[report.reporting_period] = max(periods.get(report.reporting_period, 0), report.upload_time)
+        metadata = {
+            data_type: dict(sorted(periods.items())) for data_type, periods in sorted(metadata.items())
+        }
+        self.metadata_cache.set(company_id, metadata)
+        return metadata
+
+    def get_report_coverage(
+            self,
+            company_names: Optional[List[str]] = None,
+            portfolio_id: Optional[str] = None,
+            data_types: Optional[List[Union[str, DataTypeEnum]]] = None,
+            reporting_periods: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Determines which of the given companies or the companies of a Dataland portfolio have active and accepted
+        reports, optionally restricted to the given data frameworks and reporting periods.
+        The metadata of all companies is looked up with bounded parallelism in the metadata index.
+
+        :param company_names: Names of the companies to check, e.g. ["BASF SE", "Allianz SE"].
+        :param portfolio_id: Identifier of a Dataland portfolio whose companies are checked.
+        :param data_types: The types of reporting frameworks to check, e.g. ["sfdr"]. All frameworks if empty.
+        :param reporting_periods: The fiscal years to check as strings, e.g. ["2024"]. All periods if empty.
+
+        :return: The number and share of companies covered per data type and reporting period, and the available
+        reports or the error per company.
+        :raises Exception: If neither companies nor a portfolio are given or too many companies are given.
+        """
+        data_type_values = [self.parse_data_type(data_type).value for data_type in data_types or []]
+        periods = set(reporting_periods or [])
+        companies = self._collect_companies(company_names, portfolio_id, self.settings.coverage_max_companies)
+
+        results = list(self.fanout_pool.map(in_current_context(
+            lambda company: self._get_coverage_item(company, data_type_values, periods)), companies))
+
+        counts: Dict[Tuple[str, str], int] = {}
+        for result in results:
+            for data_type, reporting_periods in result.get("reports", {}).items():
+                for reporting_period in reporting_periods:
+                    counts[(data_type, reporting_period)] = counts.get((data_type, reporting_period), 0) + 1
+        for data_type in data_type_values:
+            for reporting_period in periods:
+                counts.setdefault((data_type, reporting_period), 0)
+        return {
+            "companies": len(results),
+            "coverage": [
+                {"dataType": data_type, "reportingPeriod": reporting_period, "companies": count,
+                 "share": round(count / len(results), 4)}
+                for (data_type, reporting_period), count in sorted(counts.items())
+            ],
+            "results": results,
+        }
+
+    def _collect_companies(
+            self,
+            company_names: Optional[List[str]],
+            portfolio_id: Optional[str],
+            max_companies: int) -> List[Dict[str, str]]:
+        """
+        Collects the companies given by name and the companies of a Dataland portfolio.
+
+        :param company_names: Names of the companies, e.g. ["BASF SE", "Allianz SE"].
+        :param portfolio_id: Identifier of a Dataland portfolio of the user.
+        :param max_companies: The maximum number of companies.
+
+        :return: The companies, given either as {"companyName": ...} or {"companyId": ...}.
+        :raises Exception: If neither companies nor a portfolio are given or there are too many companies.
+        """
+        companies = [{"companyName": company_name} for company_name in dict.fromkeys(company_names or [])]
+        if portfolio_id:
+            companies.extend({"companyId": company_id} for company_id in self._get_portfolio_company_ids(portfolio_id))
+        if not companies:
+            raise ValueError("At least one company name or a portfolio id is required")
+        if len(companies) > max_companies:
+            raise ValueError(
+                f"The request contains {len(companies)} companies, but at most {max_companies} are allowed. "
+                f"Please split the request into smaller requests."
+            )
+        return companies
+
+    def _resolve_collected_company(self, company: Dict[str, str]) -> Dict[str, str]:
+        """
+        Adds the company identifier to a company given by name, and the name to a company given by identifier if
+        the name is known from the local company index.
+
+        :param company: The company, given either as {"companyName": ...} or {"companyId": ...}.
+
+        :return: The company as {"companyName": ..., "companyId": ...}, without the name if it is unknown.
+        :raises Exception: If the company name could not be resolved.
+        """
+        if "companyId" not in company:
+            return {**company, "companyId": self.get_company_id(company["companyName"])}
+        if self.company_index is not None:
+            indexed = self.company_index.get(company["companyId"])
+            if indexed is not None:
+                return {"companyName": indexed.get("companyName"), **company}
+        return dict(company)
+
+    def _get_portfolio_company_ids(self, portfolio_id: str) -> List[str]:
+        """
+        Fetches the identifiers of the companies contained in a Dataland portfolio of the user.
+
+        :param portfolio_id: The identifier of the portfolio.
+
+        :return: The unique identifiers of the companies of the portfolio.
+        """
+        portfolio = self._call_upstream(
+            "portfolio", self.client.portfolio_api.get_portfolio, service="users", portfolio_id=portfolio_id)
+        return sorted(portfolio.company_ids)
+
+    def _get_coverage_item(
+            self,
+            company: Dict[str, str],
+            data_types: List[str],
+            reporting_periods: Set[str]) -> Dict[str, Any]:
+        """
+        Looks up the available reports of a single company of a coverage check without raising.
+
+        :param company: The company, given either as {"companyName": ...} or {"companyId": ...}.
+        :param data_types: The data types to report. All data types if empty.
+        :param reporting_periods: The reporting periods to report. All reporting periods if empty.
+
+        :return: The company together with either its reports as {data type: [reporting periods]} or the error.
+        """
+        try:
+            item = self._resolve_collected_company(company)
+            metadata = self.get_company_metadata(item["companyId"])
+        except Exception as exc:
+            return {**company, **error_details(exc)}
+        item["reports"] = {
+            data_type: [period for period in periods if not reporting_periods or period in reporting_periods]
+            for data_type, periods in metadata.items()
+            if not data_types or data_type in data_types
+        }
+        item["reports"] = {data_type: periods for data_type, periods in item["reports"].items() if periods}
+        return item
+
+    def get_portfolio_aggregates(
+            self,
+            data_type: Union[str, DataTypeEnum],
+            reporting_period: str,
+            fields: List[str],
+            portfolio_id: Optional[str] = None,
+            company_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Aggregates numeric data points over the reports of the companies of a Dataland portfolio or the given companies.
+        Only companies with an available report according to the metadata index are fetched, with bounded parallelism.
+
+        :param data_type: The type of reporting framework, e.g. "sfdr".
+        :param reporting_period: The fiscal year of the published reports as a string, e.g. "2024".
+        :param fields: Dot-separated paths of the numeric data points to aggregate,
+        e.g. ["environmental.greenhouseGasEmissions.scope1GhgEmissionsInTonnes"].
+        :param portfolio_id: Identifier of a Dataland portfolio of the user whose companies are aggregated.
+        :param company_names: Names of the companies to aggregate, e.g. ["BASF SE", "Allianz SE"].
+
+        :return: The number of companies, the report coverage, and per data point the number of companies reporting a
+        value, the units and the sum, mean, median, minimum, maximum and percentiles of the values, as well as the
+        companies which could not be aggregated. Values in different units or currencies are not aggregated together,
+        instead the statistics are computed per unit and listed in "byUnit" while the overall statistics are None.
+        :raises Exception: If no data points, neither companies nor a portfolio or too many companies are given.
+        """
+        data_type = self.parse_data_type(data_type)
+        if not fields:
+            raise ValueError("At least one data point field path is required")
+        fields = list(dict.fromkeys(fields))
+        companies = self._collect_companies(company_names, portfolio_id, self.settings.aggregation_max_companies)
+
+        results = list(self.fanout_pool.map(in_current_context(
+            lambda company: self._get_aggregation_item(company, data_type, reporting_period, fields)), companies))
+
+        reported = [result for result in results if "dataPoints" in result]
+        aggregates = []
+        for field in fields:
+            data_points = [result["dataPoints"][field] for result in reported if field in result["dataPoints"]]
+            values_by_unit: Dict[Optional[str], List[float]] = {}
+            for value, unit in data_points:
+                values_by_unit.setdefault(unit, []).append(value)
+            aggregate = {
+                "field": field,
+                "companiesWithValue": len(data_points),
+                "units": {unit: len(values) for unit, values in values_by_unit.items() if unit is not None},
+            }
+            if len(values_by_unit) <= 1:
+                aggregate.update(summarize([value for value, _ in data_points]))
+            else:
+                aggregate.update(summarize([]))
+                aggregate["byUnit"] = [
+                    {"unit": unit, "companiesWithValue": len(values), **summarize(values)}
+                    for unit, values in sorted(values_by_unit.items(), key=lambda item: -len(item[1]))
+                ]
+            aggregates.append(aggregate)
+        return {
+            "dataType": data_type.value,
+            "reportingPeriod": reporting_period,
+            "companies": len(results),
+            "companiesWithReport": len(reported),
+            "reportCoverage": round(len(reported) / len(results), 4),
+            "aggregates": aggregates,
+            "errors": [result for result in results if "error" in result],
+        }
+
+    def _get_aggregation_item(
+            self,
+            company: Dict[str, str],
+            data_type: DataTypeEnum,
+            reporting_period: str,
+            fields: List[str]) -> Dict[str, Any]:
+        """
+        Extracts the numeric data points of the report of a single company of an aggregation without raising.
+        If a company has multiple active datasets for the reporting period, the most recently uploaded one is used.
+
+        :param company: The company, given either as {"companyName": ...} or {"companyId": ...}.
+        :param data_type: The type of reporting framework, e.g. DataTypeEnum.SFDR.
+        :param reporting_period: The fiscal year of the published report as a string, e.g. "2024".
+        :param fields: Dot-separated paths of the numeric data points.
+
+        :return: The company together with either its numeric data points as {field: (value, unit)}, the error or
+        nothing if the company has no report.
+        """
+        try:
+            item = self._resolve_collected_company(company)
+            if reporting_period not in self.get_company_metadata(item["companyId"]).get(data_type.value, {}):
+                return item
+            report_data = self._get_full_report_data(item["companyId"], reporting_period, data_type)
+        except Exception as exc:
+            return {**company, **error_details(exc)}
+        if not report_data:
+            return item
+        dataset = max(report_data, key=lambda dataset: dataset["metaInfo"]["uploadTime"])
+        data_points = {field: extract_data_point(dataset.get("data"), field) for field in fields}
+        item["dataPoints"] = {field: data_point for field, data_point in data_points.items() if data_point[0] is not None}
+        return item
+
     def get_report_data(
             self,
             company_name: str,
             reporting_period: str,
-            data_type: DataTypeEnum) -> Dict[str, Union[str, SfdrData, EutaxonomyFinancialsData, EutaxonomyNonFinancialsData, NuclearAndGasData]]:
+            data_type: Union[str, DataTypeEnum],
+            fields: Optional[List[str]] = None,
+            output_format: str = "json") -> Dict[str, Any]:
         """
         Fetches the Dataland reports data for a given company name, reporting period and data framework (SFDR, EU Taxonomy,...).
         Calls the respective GET-Endpoint of Dataland API via the REPORT_DISPATCH.
+        The report data is reduced to the selected fields, pruned of empty values, optionally flattened
+        into a table and limited in size according to the server settings.
 
         :param company_name: Name of the company for which the SFDR report is retrieved, e.g. "BASF SE".
         :param reporting_period: The fiscal year of the published report as a string, e.g. "2024".
-        :param data_type: The type of reporting framework, e.g. DataTypeEnum.SFDR.
+        :param data_type: The type of reporting framework, e.g. DataTypeEnum.SFDR or "sfdr".
+        :param fields: Dot-separated paths of the report fields to return, e.g. ["environmental.greenhouseGasEmissions"].
+        All fields are returned if empty.
+        :param output_format: "json" for the nested report data or "table" for one table row per data point.
 
         :return: The report data and source URL for the given company name, reporting period and data framework.
         :raises Exception: If no company or report was found or an unexpected error occurred.
         """
+        data_type = self.parse_data_type(data_type)
+        self._validate_output_format(output_format)
         company_id = self.get_company_id(company_name=company_name)
-        report_data = self.report_dispatch[data_type](company_id=company_id, reporting_period=reporting_period)
+        report = self._fetch_report_data(
+            company_id=company_id,
+            company_name=company_name,
+            reporting_period=reporting_period,
+            data_type=data_type,
+            fields=fields,
+        )
+        report_data = report["report_data"]
+        with TRACER.span("format_report", **{"report.output_format": output_format}):
+            if output_format == "table":
+                report_data = rows_to_table(flatten_report(report_data, company_name, reporting_period, data_type.value))
+            report["report_data"] = truncate_to_budget(report_data, self.settings.max_report_bytes)
+        return report
+
+    def get_batch_report_data(
+            self,
+            company_names: List[str],
+            reporting_periods: List[str],
+            data_types: List[Union[str, DataTypeEnum]],
+            fields: Optional[List[str]] = None,
+            output_format: str = "json",
+            on_progress: Optional[Callable[[int, int, str], None]] = None) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Fetches the reports for every combination of the given companies, reporting periods and data frameworks.
+        Each company is resolved only once and all requests are executed with bounded parallelism.
+        Failures are reported per item instead of failing the whole batch.
+        In the "table" output format, all reports are stacked into a single table.
+
+        :param company_names: Names of the companies for which the reports are retrieved, e.g. ["BASF SE", "Allianz SE"].
+        :param reporting_periods: The fiscal years of the published reports as strings, e.g. ["2023", "2024"].
+        :param data_types: The types of reporting frameworks, e.g. [DataTypeEnum.SFDR] or ["sfdr"].
+        :param fields: Dot-separated paths of the report fields to return for every report. All fields if empty.
+        :param output_format: "json" for the nested report data or "table" for one table row per data point.
+        :param on_progress: Optional callback invoked from the worker threads whenever a combination is completed,
+        with the number of completed combinations, the total number and a short status message.
+
+        :return: In the "json" output format, one entry per combination containing the company name, reporting period
+        and data type together with either the report data and source URL or an error message.
+        In the "table" output format, the stacked table with the source URLs and errors of all combinations.
+        :raises Exception: If the batch is empty, exceeds the maximum number of items or contains unsupported data types.
+        """
+        data_types = [self.parse_data_type(data_type) for data_type in data_types]
+        self._validate_output_format(output_format)
+        company_names = list(dict.fromkeys(company_names))
+        items = [
+            (company_name, reporting_period, data_type)
+            for company_name in company_names
+            for reporting_period in dict.fromkeys(reporting_periods)
+            for data_type in dict.fromkeys(data_types)
+        ]
+        if not items:
+            raise ValueError("At least one company name, reporting period and data type is required")
+        if len(items) > self.settings.batch_max_items:
+            raise ValueError(
+                f"The batch contains {len(items)} reports, but at most {self.settings.batch_max_items} are allowed. "
+                f"Please split the request into smaller batches."
+            )
+
+        pool = self.fanout_pool
+        resolutions = dict(zip(company_names, pool.map(in_current_context(self._try_get_company_id), company_names)))
+        get_batch_item = in_current_context(self._get_batch_item)
+        futures = {
+            pool.submit(get_batch_item, *item, resolutions[item[0]], fields): index
+            for index, item in enumerate(items)
+        }
+        results = [None] * len(items)
+        for completed, future in enumerate(as_completed(futures), start=1):
+            result = results[futures[future]] = future.result()
+            if on_progress is not None:
+                status = result.get("error", "retrieved")
+                on_progress(completed, len(items),
+                            f"{result['companyName']} {result['reportingPeriod']} {result['dataType']}: {status}")
+
+        if output_format == "table":
+            return self._stack_batch_results(results)
+        budget = self._batch_report_budget(sum("report_data" in result for result in results))
+        for result in results:
+            if "report_data" in result:
+                result["report_data"] = truncate_to_budget(result["report_data"], budget)
+        return results
+
+    def _batch_report_budget(self, reports: int) -> int:
+        """
+        Determines the size limit per report of a batch, so that the whole batch response stays within the batch size
+        limit.
+
+        :param reports: The number of reports contained in the batch response.
+
+        :return: The size limit per report in bytes, 0 if not limited.
+        """
+        budget = self.settings.max_report_bytes
+        if self.settings.batch_max_bytes > 0:
+            share = self.settings.batch_max_bytes // max(reports, 1)
+            budget = min(budget, share) if budget > 0 else share
+        return budget
+
+    def _stack_batch_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Stacks the reports of a batch into a single table, listing the source URLs and errors separately.
+        The table is limited in size to the size limit per report of the batch for each contained report.
+
+        :param results: The batch entries as returned by _get_batch_item.
+
+        :return: The table as {"columns": [...], "rows": [[...], ...], "sources": [...], "errors": [...]}.
+        """
+        rows, sources, errors = [], [], []
+        for result in results:
+            if "error" in result:
+                errors.append(result)
+                continue
+            rows.extend(flatten_report(
+                result["report_data"], result["companyName"], result["reportingPeriod"], result["dataType"]))
+            sources.append({key: value for key, value in result.items() if key != "report_data"})
+        table = {**rows_to_table(rows), "sources": sources, "errors": errors}
+        return truncate_to_budget(table, self._batch_report_budget(len(sources)) * max(len(sources), 1))
+
+    @staticmethod
+    def _validate_output_format(output_format: str) -> None:
+        """
+        Checks whether the requested output format is supported.
+
+        :param output_format: The requested output format, e.g. "table".
+
+        :raises Exception: If the output format is not supported.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unsupported output format '{output_format}'. Supported output formats are: {', '.join(OUTPUT_FORMATS)}"
+            )
+
+    def _try_get_company_id(self, company_name: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Fetches the company identifier without raising, so that a single unknown company does not fail a batch.
+
+        :param company_name: The name of the company as a string, e.g. "BASF SE".
+
+        :return: The company identifier and None if successful, otherwise None and the structured error.
+        """
+        try:
+            return self.get_company_id(company_name=company_name), None
+        except Exception as exc:
+            return None, error_details(exc)
+
+    @TRACER.traced("batch_item")
+    def _get_batch_item(
+            self,
+            company_name: str,
+            reporting_period: str,
+            data_type: DataTypeEnum,
+            resolution: Tuple[Optional[str], Optional[Dict[str, Any]]],
+            fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Fetches a single report of a batch and wraps the result or the error into one entry.
+
+        :param company_name: Name of the company for which the report is retrieved, e.g. "BASF SE".
+        :param reporting_period: The fiscal year of the published report as a string, e.g. "2024".
+        :param data_type: The type of reporting framework, e.g. DataTypeEnum.SFDR.
+        :param resolution: The company identifier and the structured error of the company resolution.
+        :param fields: Dot-separated paths of the report fields to return. All fields are returned if empty.
+
+        :return: The batch entry containing either the report data and source URL or an error message.
+        """
+        item = {"companyName": company_name, "reportingPeriod": reporting_period, "dataType": data_type.value}
+        company_id, error = resolution
+        if company_id is None:
+            return {**item, **error}
+        try:
+            report = self._fetch_report_data(
+                company_id=company_id,
+                company_name=company_name,
+                reporting_period=reporting_period,
+                data_type=data_type,
+                fields=fields,
+            )
+        except Exception as exc:
+            return {**item, **error_details(exc)}
+        return {**item, **report}
+
+    def parse_data_type(self, data_type: Union[str, DataTypeEnum]) -> DataTypeEnum:
+        """
+        Converts the name of a reporting framework to the corresponding supported DataTypeEnum.
+
+        :param data_type: The name of the reporting framework as used by Dataland, e.g. "sfdr", or a DataTypeEnum.
+
+        :return: The corresponding DataTypeEnum, e.g. DataTypeEnum.SFDR.
+        :raises Exception: If the reporting framework is not supported.
+        """
+        for supported_data_type in self.report_dispatch:
+            if supported_data_type.value == data_type.strip().lower():
+                return supported_data_type
+        supported = ", ".join(supported_data_type.value for supported_data_type in self.report_dispatch)
+        raise ValueError(f"Unsupported data type '{data_type}'. Supported data types are: {supported}")
+
+    def _fetch_report_data(
+            self,
+            company_id: str,
+            company_name: str,
+            reporting_period: str,
+            data_type: DataTypeEnum,
+            fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Fetches the report data of an already resolved company via the REPORT_DISPATCH
+        and reduces it to the selected fields. The size limit is applied by the caller.
+
+        :param company_id: The unique identifier of a company used in Dataland.
+        :param company_name: Name of the company, only used in error messages.
+        :param reporting_period: The fiscal year of the published report as a string, e.g. "2024".
+        :param data_type: The type of reporting framework, e.g. DataTypeEnum.SFDR.
+        :param fields: Dot-separated paths of the report fields to return. All fields are returned if empty.
+
+        :return: The report data and source URL.
+        :raises Exception: If no report was found or an unexpected error occurred.
+        """
+        report_data = self._get_full_report_data(
+            company_id=company_id,
+            reporting_period=reporting_period,
+            data_type=data_type,
+        )
 
         if not report_data:
             raise ValueError(
@@ -98,8 +836,112 @@ class DatalandMCPUtils:
             reporting_period=reporting_period,
             data_type=data_type,
         )
+        with TRACER.span("shape_report"):
+            report_data = shape_report(
+                report_data,
+                field_paths=fields,
+                prune=self.settings.prune_empty_fields,
+            )
         return {"data_url": data_url, "report_data": report_data}
 
+    @TRACER.traced("get_full_report_data")
+    def _get_full_report_data(self, company_id: str, reporting_period: str, data_type: DataTypeEnum) -> Any:
+        """
+        Retrieves the complete report data from the report cache or, if not cached, from Dataland.
+        Cached reports older than the revalidation interval are only reused if the upload time of the active
+        dataset in the Dataland metadata is unchanged, so a newly accepted dataset replaces the cached one.
+        While Dataland is degraded and the revalidation fails, the cached report is returned without revalidation.
+
+        :param company_id: The unique identifier of a company used in Dataland.
+        :param reporting_period: The fiscal year of the published report as a string, e.g. "2024".
+        :param data_type: The type of reporting framework, e.g. DataTypeEnum.SFDR.
+
+        :return: The report data as JSON compatible list of datasets, which is empty if no report exists.
+        """
+        cache_key = f"{company_id}|{data_type.value}|{reporting_period}"
+        entry = self.report_cache.get(cache_key)
+        if entry is not None:
+            now = time.time()
+            if now - entry["validatedAt"] < self.settings.report_cache_revalidate_interval:
+                return entry["reportData"]
+            try:
+                latest_upload_time = self._get_latest_upload_time(
+                    company_id=company_id,
+                    reporting_period=reporting_period,
+                    data_type=data_type,
+                )
+            except UpstreamError:
+                return entry["reportData"]
+            if latest_upload_time == entry["uploadTime"]:
+                # The validation time is only kept in memory, so the compressed report is not rewritten to the store
+                self.report_cache.touch(cache_key, {**entry, "validatedAt": now})
+                return entry["reportData"]
+            self.report_cache.invalidate(cache_key)
+            self.metadata_cache.invalidate(company_id)
+
+        return self.in_flight.do(
+            f"report|{cache_key}",
+            lambda: self._fetch_and_cache_report_data(company_id, reporting_period, data_type, cache_key),
+        )
+
+    def _fetch_and_cache_report_data(
+            self,
+            company_id: str,
+            reporting_period: str,
+            data_type: DataTypeEnum,
+            cache_key: str) -> Any:
+        """
+        Fetches the complete report data from Dataland and caches it if a report exists.
+
+        :param company_id: The unique identifier of a company used in Dataland.
+        :param reporting_period: The fiscal year of the published report as a string, e.g. "2024".
+        :param data_type: The type of reporting framework, e.g. DataTypeEnum.SFDR.
+        :param cache_key: The key under which the report data is cached.
+
+        :return: The report data as JSON compatible list of datasets, which is empty if no report exists.
+        """
+        report_data = to_jsonable(self._call_upstream(
+            f"{data_type.value}_data",
+            self.report_dispatch[data_type],
+            company_id=company_id,
+            reporting_period=reporting_period,
+        ))
+        if report_data:
+            self.report_cache.set(cache_key, {
+                "uploadTime": max(dataset["metaInfo"]["uploadTime"] for dataset in report_data),
+                "validatedAt": time.time(),
+                "reportData": report_data,
+            })
+        return report_data
+
+    def _get_latest_upload_time(self, company_id: str, reporting_period: str, data_type: DataTypeEnum) -> Optional[int]:
+        """
+        Looks up the upload time of the most recent active and accepted dataset in the Dataland metadata.
+
+        :param company_id: The unique identifier of a company used in Dataland.
+        :param reporting_period: The fiscal year of the published report as a string, e.g. "2024".
+        :param data_type: The type of reporting framework, e.g. DataTypeEnum.SFDR.
+
+        :return: The upload time in milliseconds since epoch, or None if no such dataset exists.
+        """
+        from dataland_backend.models.qa_status import QaStatus
+
+        meta_data = self.in_flight.do(
+            f"meta|{company_id}|{data_type.value}|{reporting_period}",
+            lambda: self._call_upstream(
+                "meta_info",
+                self.client.meta_api.get_list_of_data_meta_info,
+                company_id=company_id,
+                data_type=data_type,
+                reporting_period=reporting_period,
+                show_only_active=True,
+                qa_status=QaStatus.ACCEPTED))
+        return max((report.upload_time for report in meta_data), default=None)
+
+    def invalidate_report_cache(self) -> None:
+        """Drops all cached reports, so that the next requests fetch them from Dataland again."""
+        self.report_cache.invalidate()
+
     @staticmethod
     def construct_data_url(company_id: str, reporting_period: str, data_type: DataTypeEnum) -> str:
         """
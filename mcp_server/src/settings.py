@@ -0,0 +1,141 @@
+"""This module contains the configuration of the Dataland MCP server."""
+
+import os
+from dataclasses import dataclass, fields, replace
+from typing import Any, get_type_hints
+
+ENV_PREFIX = "DATALAND_MCP_"
+
+
+def _parse_env_value(value: str, target_type: type) -> Any:
+    """
+    Converts the string value of an environment variable to the annotated type of the corresponding setting.
+
+    :param value: The raw value of the environment variable.
+    :param target_type: The type the setting is annotated with, e.g. float for a setting with the default 600.
+
+    :return: The converted value.
+    """
+    if target_type is bool:
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return target_type(value)
+
+
+@dataclass(frozen=True)
+class ServerSettings:
+    """
+    Tunable settings of the Dataland MCP server.
+    Each setting can be overridden by an environment variable named DATALAND_MCP_<SETTING_NAME>,
+    e.g. DATALAND_MCP_COMPANY_CACHE_TTL=3600.
+    """
+
+    # Company name -> company id resolution cache
+    company_cache_size: int = 1024
+    company_cache_ttl: float = 24 * 60 * 60
+
+    # Local search index of all Dataland companies for fuzzy name matching without a Dataland request
+    company_index_enabled: bool = False
+    company_index_refresh_interval: float = 6 * 60 * 60
+    company_index_chunk_size: int = 1000
+    company_index_match_threshold: float = 0.9
+
+    # Number of worker processes serving the streamable-http transport, each with its own in-memory caches
+    # The rate limit and the byte limit of the report cache are divided among the workers
+    http_workers: int = 1
+
+    # Connection pools shared by all requests to a Dataland service
+    pool_maxsize: int = 16
+    keep_alive: bool = True
+    connect_timeout: float = 5.0
+    read_timeout: float = 60.0
+
+    # Worker pool running the blocking Dataland calls of the tools
+    tool_max_workers: int = 16
+    tool_timeout: float = 120.0
+
+    # Batch retrieval of reports for multiple companies, reporting periods and frameworks
+    batch_max_workers: int = 8
+    batch_max_items: int = 100
+    batch_max_bytes: int = 2_000_000
+
+    # Reduction of the report data returned to the LLM, a maximum of 0 bytes disables the limit
+    prune_empty_fields: bool = True
+    max_report_bytes: int = 200_000
+
+    # Cache of the full report data, entries are revalidated against the upload times of the Dataland metadata
+    report_cache_max_entries: int = 10_000
+    report_cache_max_bytes: int = 128 * 1024 * 1024
+    report_cache_ttl: float = 7 * 24 * 60 * 60
+    report_cache_revalidate_interval: float = 10 * 60
+
+    # Index of the available reports per company built from the Dataland metadata, refreshed per company after the TTL
+    metadata_cache_max_entries: int = 50_000
+    metadata_cache_ttl: float = 60 * 60
+    coverage_max_companies: int = 1000
+
+    # Aggregation of data points over the reports of many companies, e.g. of a portfolio
+    aggregation_max_companies: int = 500
+
+    # Persistent cache store keeping cached data across restarts, disabled if no directory is configured
+    # A Redis compatible server configured by URL, e.g. redis://redis:6379/0, is shared by all workers and replicas
+    cache_url: str = ""
+    cache_path: str = ""
+    cache_store_max_bytes: int = 512 * 1024 * 1024
+    cache_warm_load: bool = True
+
+    # Rate limit of the requests per Dataland service, a rate of 0 disables the limit
+    upstream_rate_limit: float = 20.0
+    upstream_rate_burst: int = 40
+    upstream_rate_limit_wait: float = 10.0
+
+    # Retries of idempotent Dataland requests failing with a transient error, using jittered exponential backoff
+    upstream_max_retries: int = 2
+    upstream_retry_base_delay: float = 0.5
+    upstream_retry_max_delay: float = 8.0
+
+    # Circuit breakers per Dataland endpoint, a failure threshold of 0 disables them
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_timeout: float = 30.0
+
+    # Tracing of the tool calls, exported as OpenTelemetry JSON spans to the "console" (stderr) or a "file"
+    # Calls slower than the threshold in seconds are logged with the breakdown of their spans, 0 disables the logging
+    tracing_exporter: str = ""
+    tracing_file: str = "dataland_mcp_traces.jsonl"
+    slow_call_threshold: float = 5.0
+
+    # Background probe of the Dataland connectivity reported by the /ready route
+    readiness_probe_interval: float = 30.0
+    readiness_probe_company: str = "BASF SE"
+
+    def per_worker(self, workers: int) -> "ServerSettings":
+        """
+        Divides the limits applying to the whole server among its worker processes, i.e. the rate limit of the
+        requests to Dataland and the byte limit of the in-memory report cache.
+
+        :param workers: The number of worker processes.
+
+        :return: The settings of a single worker process.
+        """
+        if workers <= 1:
+            return self
+        return replace(
+            self,
+            upstream_rate_limit=self.upstream_rate_limit / workers,
+            upstream_rate_burst=max(self.upstream_rate_burst // workers, 1),
+            report_cache_max_bytes=self.report_cache_max_bytes // workers,
+        )
+
+    @classmethod
+    def from_env(cls) -> "ServerSettings":
+        """
+        Creates the server settings from the environment, using the defaults for all unset variables.
+
+        :return: The server settings.
+        """
+        overrides = {}
+        types = get_type_hints(cls)
+        for field in fields(cls):
+            value = os.getenv(ENV_PREFIX + field.name.upper())
+            if value is not None and value != "":
+                overrides[field.name] = _parse_env_value(value, types[field.name])
+        return cls(**overrides)
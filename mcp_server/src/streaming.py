@@ -0,0 +1,44 @@
+"""This module contains helpers to report the progress of long-running tools."""
+
+import asyncio
+import contextvars
+from typing import Optional
+
+from fastmcp import Context
+
+
+class ProgressReporter:
+    """
+    Sends MCP progress notifications of a tool call from worker threads.
+    Over the streamable-http transport, each notification is streamed to the client as soon as it is sent.
+    Notifications are only sent if the client requested progress updates for the tool call.
+    """
+
+    def __init__(self, ctx: Optional[Context], loop: asyncio.AbstractEventLoop):
+        """
+        :param ctx: The context of the tool call, or None if no context is available.
+        :param loop: The event loop serving the tool call.
+        """
+        self.ctx = ctx
+        self.loop = loop
+        # The notifications are sent within the context variables of the tool call, which identify its request
+        self._context = contextvars.copy_context()
+        self._tasks = set()
+
+    def __call__(self, completed: int, total: int, message: str) -> None:
+        """
+        Schedules a progress notification on the event loop without waiting for it to be sent.
+
+        :param completed: The number of completed steps.
+        :param total: The total number of steps.
+        :param message: A short description of the completed step.
+        """
+        if self.ctx is None:
+            return
+        self.loop.call_soon_threadsafe(self._send, completed, total, message, context=self._context)
+
+    def _send(self, completed: int, total: int, message: str) -> None:
+        """Starts sending a progress notification on the event loop, keeping a reference until it is sent."""
+        task = self.loop.create_task(self.ctx.report_progress(progress=completed, total=total, message=message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
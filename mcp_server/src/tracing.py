@@ -0,0 +1,259 @@
+"""This module contains the tracing of tool calls in spans compatible with the OpenTelemetry trace data model."""
+
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+EXPORTERS = ("", "console", "file")
+
+
+class Span:
+    """
+    A timed operation within a trace, e.g. a tool call, a utils function or a Dataland request.
+    All spans of a trace share the list of finished spans of their root span, so that the root span can report the
+    breakdown of the whole trace once it ends.
+    """
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict[str, Any]] = None):
+        """
+        :param name: The name of the span, e.g. "tool SFDR_Report".
+        :param parent: The enclosing span, or None for the root span of a new trace.
+        :param attributes: Attributes describing the operation, e.g. {"dataland.endpoint": "company_search"}.
+        """
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "UNSET"
+        self.status_message: Optional[str] = None
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+        self._start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.finished: List["Span"] = parent.finished if parent is not None else []
+        self._finished_lock: threading.Lock = parent._finished_lock if parent is not None else threading.Lock()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Sets an attribute of the span."""
+        self.attributes[key] = value
+
+    def end(self, exc: Optional[BaseException] = None) -> None:
+        """
+        Ends the span and records it as finished span of its trace.
+
+        :param exc: The exception raised by the operation, marking the span as failed.
+        """
+        self.duration = time.perf_counter() - self._start
+        self.end_time_ns = self.start_time_ns + int(self.duration * 1e9)
+        if exc is not None:
+            self.status = "ERROR"
+            self.status_message = str(exc) or type(exc).__name__
+        else:
+            self.status = "OK"
+        with self._finished_lock:
+            self.finished.append(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converts the span into the JSON encoding of the OpenTelemetry protocol (OTLP).
+
+        :return: The span as dictionary with camel case keys, e.g. {"traceId": ..., "spanId": ..., "name": ...}.
+        """
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns),
+            "attributes": [{"key": key, "value": _attribute_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": {"UNSET": 0, "OK": 1, "ERROR": 2}[self.status]},
+        }
+        if self.parent is not None:
+            span["parentSpanId"] = self.parent.span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    """Encodes an attribute value as OTLP any value."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """
+    Records spans of the tool calls, propagating the current span via context variables.
+    Finished traces are exported as OTLP JSON lines to the console or a file, and traces of tool calls slower than
+    the slow call threshold are logged with the breakdown of their spans.
+    If neither an exporter nor a threshold is configured, no spans are recorded.
+    """
+
+    def __init__(self):
+        self.exporter = ""
+        self.slow_call_threshold = 0.0
+        self._output: Optional[TextIO] = None
+        self._output_lock = threading.Lock()
+        self._current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+            "dataland_mcp_current_span", default=None)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return bool(self.exporter) or self.slow_call_threshold > 0
+
+    def configure(self, exporter: str = "", path: str = "", slow_call_threshold: float = 0.0) -> None:
+        """
+        Configures the export of the traces and the logging of slow tool calls.
+
+        :param exporter: "console" to write the traces to stderr, "file" to append them to a file, "" to not export.
+        :param path: Path of the file the traces are appended to by the file exporter.
+        :param slow_call_threshold: Duration in seconds of a tool call from which its trace is logged, 0 disables it.
+        :raises Exception: If the exporter is not supported.
+        """
+        if exporter not in EXPORTERS:
+            raise ValueError(f"Unsupported trace exporter '{exporter}'. Supported exporters are: console, file")
+        self.close()
+        self.exporter = exporter
+        self.slow_call_threshold = slow_call_threshold
+        if exporter == "console":
+            self._output = sys.stderr
+        elif exporter == "file":
+            self._output = open(path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        """Closes the trace file of the file exporter."""
+        with self._output_lock:
+            if self._output is not None and self._output is not sys.stderr:
+                self._output.close()
+            self._output = None
+
+    @property
+    def current_span(self) -> Optional[Span]:
+        """The innermost span of the current context."""
+        return self._current_span.get()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """
+        Records the enclosed operation as span, which is the child of the current span or the root of a new trace.
+
+        :param name: The name of the span, e.g. "dataland company_search".
+        :param attributes: Attributes describing the operation.
+
+        :return: A context manager yielding the span, or None if tracing is disabled.
+        """
+        if not self.enabled:
+            yield None
+            return
+        span = Span(name, self._current_span.get(), attributes)
+        token = self._current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.end(exc)
+            raise
+        else:
+            span.end()
+        finally:
+            self._current_span.reset(token)
+            if span.parent is None:
+                self._finish_trace(span)
+
+    def traced(self, name: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """
+        Decorates a function so that each of its calls is recorded as span.
+
+        :param name: The name of the spans, the qualified name of the function if None.
+
+        :return: The decorator.
+        """
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def _finish_trace(self, root: Span) -> None:
+        """Exports the spans of a finished trace and logs them if the trace is slow."""
+        with root._finished_lock:
+            spans = list(root.finished)
+        if self._output is not None:
+            lines = "".join(json.dumps(span.to_dict(), separators=(",", ":")) + "\n" for span in spans)
+            with self._output_lock:
+                if self._output is not None:
+                    self._output.write(lines)
+                    self._output.flush()
+        if 0 < self.slow_call_threshold <= root.duration:
+            logger.warning("Slow call %s took %.2fs (trace %s):\n%s",
+                           root.name, root.duration, root.trace_id, format_breakdown(spans))
+
+
+def format_breakdown(spans: List[Span]) -> str:
+    """
+    Formats the spans of a trace as indented tree with their durations, in the order they started.
+
+    :param spans: The finished spans of a trace.
+
+    :return: The breakdown, one line per span.
+    """
+    children: Dict[Optional[str], List[Span]] = {}
+    span_ids = {span.span_id for span in spans}
+    for span in sorted(spans, key=lambda span: span.start_time_ns):
+        parent_id = span.parent.span_id if span.parent is not None and span.parent.span_id in span_ids else None
+        children.setdefault(parent_id, []).append(span)
+
+    lines = []
+
+    def add(span: Span, depth: int) -> None:
+        label = "  " * depth + span.name + (" [error]" if span.status == "ERROR" else "")
+        lines.append(f"  {label:<70} {span.duration * 1000:10.1f} ms")
+        for child in children.get(span.span_id, []):
+            add(child, depth + 1)
+
+    for root in children.get(None, []):
+        add(root, 0)
+    return "\n".join(lines)
+
+
+def in_current_context(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Binds a function to a copy of the current context, so that spans recorded by it on another thread are
+    children of the current span. Every call runs in its own copy, so the function can run on several threads at once.
+
+    :param func: The function to run on another thread.
+
+    :return: The bound function.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
+
+
+TRACER = Tracer()
@@ -0,0 +1,152 @@
+"""
+Tests of the circuit breaker state machine and its interplay with the rate limit of the upstream guard.
+
+Usage (from the mcp_server directory):
+    python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from resilience import CircuitBreaker, UpstreamError, UpstreamGuard  # noqa: E402
+
+
+class FakeClock:
+    """A manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TransientError(Exception):
+    status = 503
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0, clock=self.clock)
+
+    def open_circuit(self):
+        for _ in range(2):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_opens_after_consecutive_failures(self):
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.retry_after(), 30.0)
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_single_trial_after_reset_timeout(self):
+        self.open_circuit()
+        self.clock.now += 30.0
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.retry_after(), 30.0)
+        self.clock.now += 10.0
+        self.assertEqual(self.breaker.retry_after(), 20.0)
+
+    def test_successful_trial_closes_circuit(self):
+        self.open_circuit()
+        self.clock.now += 30.0
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_failed_trial_reopens_circuit(self):
+        self.open_circuit()
+        self.clock.now += 30.0
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertEqual(self.breaker.retry_after(), 30.0)
+
+    def test_released_trial_lets_next_request_through(self):
+        self.open_circuit()
+        self.clock.now += 30.0
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+        self.assertEqual(self.breaker.retry_after(), 0.0)
+        self.assertTrue(self.breaker.allow())
+
+    def test_stale_trial_is_replaced_after_reset_timeout(self):
+        self.open_circuit()
+        self.clock.now += 30.0
+        self.assertTrue(self.breaker.allow())
+        self.clock.now += 30.0
+        self.assertTrue(self.breaker.allow())
+
+    def test_disabled_breaker_never_opens(self):
+        breaker = CircuitBreaker(failure_threshold=0, reset_timeout=30.0, clock=self.clock)
+        for _ in range(10):
+            breaker.record_failure()
+        self.assertTrue(breaker.allow())
+
+
+class UpstreamGuardTest(unittest.TestCase):
+
+    def create_guard(self, **overrides) -> UpstreamGuard:
+        settings = dict(rate_limit=0.0, rate_burst=1, rate_limit_wait=0.0, max_retries=0, retry_base_delay=0.0,
+                        retry_max_delay=0.0, failure_threshold=1, reset_timeout=30.0)
+        settings.update(overrides)
+        return UpstreamGuard(**settings)
+
+    def test_trial_rejected_by_rate_limit_is_released(self):
+        guard = self.create_guard(rate_limit=0.001, rate_burst=1)
+        clock = FakeClock()
+        breaker = guard.get_breaker("company_search")
+        breaker._clock = clock
+
+        def fail():
+            raise TransientError("Service Unavailable")
+
+        with self.assertRaises(UpstreamError):
+            guard.call("backend", "company_search", fail)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        clock.now += 30.0
+        with self.assertRaises(UpstreamError) as rejected:
+            guard.call("backend", "company_search", lambda: "response")
+        self.assertIn("rate limit", str(rejected.exception))
+
+        guard.rate_limit = 0.0
+        self.assertEqual(guard.call("backend", "company_search", lambda: "response"), "response")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_open_circuit_reports_retry_after(self):
+        guard = self.create_guard()
+
+        def fail():
+            raise TransientError("Service Unavailable")
+
+        with self.assertRaises(UpstreamError):
+            guard.call("backend", "company_search", fail)
+        with self.assertRaises(UpstreamError) as rejected:
+            guard.call("backend", "company_search", lambda: "response")
+        self.assertGreater(rejected.exception.retry_after, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Tests of reading the server settings from the environment.
+
+Usage (from the mcp_server directory):
+    python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from settings import ServerSettings  # noqa: E402
+
+
+class ServerSettingsTest(unittest.TestCase):
+
+    def test_fractional_value_of_float_setting_with_int_default(self):
+        with mock.patch.dict(os.environ, {"DATALAND_MCP_REPORT_CACHE_REVALIDATE_INTERVAL": "0.5"}):
+            settings = ServerSettings.from_env()
+        self.assertEqual(settings.report_cache_revalidate_interval, 0.5)
+
+    def test_values_are_converted_to_annotated_types(self):
+        environ = {"DATALAND_MCP_BATCH_MAX_ITEMS": "7", "DATALAND_MCP_KEEP_ALIVE": "off",
+                   "DATALAND_MCP_CACHE_PATH": "/tmp/cache"}
+        with mock.patch.dict(os.environ, environ):
+            settings = ServerSettings.from_env()
+        self.assertEqual(settings.batch_max_items, 7)
+        self.assertIs(settings.keep_alive, False)
+        self.assertEqual(settings.cache_path, "/tmp/cache")
+
+
+if __name__ == "__main__":
+    unittest.main()